@@ -0,0 +1,29 @@
+"""document_sha256_index
+
+Revision ID: a9d4c2e61f38
+Revises: f8a5b6c93d17
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "a9d4c2e61f38"
+down_revision: str | None = "f8a5b6c93d17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Lookup index for reusing extracted text across identical uploads
+    op.create_index(
+        "ix_documents_sha256_hash",
+        "documents",
+        ["sha256_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_sha256_hash", table_name="documents")
@@ -1,3 +1,4 @@
+import os
 import uuid
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
@@ -11,7 +12,7 @@ from app.models.document import Document
 from app.models.user import User
 from app.schemas.document import DocumentUploadResponse
 from app.services.audit import write_audit
-from app.services.magic import validate_magic_bytes
+from app.services.magic import MAGIC_PREFIX_LEN, validate_magic_bytes
 from app.services.storage import compute_sha256, get_file_bytes, upload_file
 
 router = APIRouter(prefix="/documents", tags=["documents"])
@@ -43,16 +44,18 @@ def upload_document(
             detail=f"File type '{content_type}' not allowed. Use PDF, JPG, or PNG.",
         )
 
-    # Read file content
-    file_bytes = file.file.read()
-    if len(file_bytes) > MAX_FILE_SIZE:
+    # Size check from the spooled upload — content is never buffered whole
+    source = file.file
+    file_size = source.seek(0, os.SEEK_END)
+    if file_size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File too large. Maximum 50 MB.",
         )
 
     # Validate magic bytes
-    if not validate_magic_bytes(file_bytes, content_type):
+    source.seek(0)
+    if not validate_magic_bytes(source.read(MAGIC_PREFIX_LEN), content_type):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=(
@@ -62,7 +65,8 @@ def upload_document(
         )
 
     # Compute SHA256
-    sha256 = compute_sha256(file_bytes)
+    source.seek(0)
+    sha256 = compute_sha256(source)
 
     # Create document record (need ID for storage path)
     doc = Document(
@@ -70,7 +74,7 @@ def upload_document(
         original_filename=file.filename or "unknown",
         storage_path="",  # updated after upload
         mime_type=content_type,
-        file_size_bytes=len(file_bytes),
+        file_size_bytes=file_size,
         doc_type=doc_type,
         processing_status="uploaded",
         sha256_hash=sha256,
@@ -80,12 +84,14 @@ def upload_document(
     db.flush()
 
     # Upload to storage
+    source.seek(0)
     storage_path = upload_file(
-        file_bytes=file_bytes,
+        source,
         filename=file.filename or f"{doc.id}.bin",
         case_id=case_id,
         document_id=doc.id,
         mime_type=content_type,
+        size=file_size,
     )
     doc.storage_path = storage_path
 
@@ -96,7 +102,7 @@ def upload_document(
         "document.uploaded",
         "document",
         doc.id,
-        {"case_id": str(case_id), "filename": file.filename, "file_size": len(file_bytes)},
+        {"case_id": str(case_id), "filename": file.filename, "file_size": file_size},
     )
     write_audit(
         db,
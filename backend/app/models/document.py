@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import Float, ForeignKey, Integer, String
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,9 @@ from app.models.base import Base, TimestampMixin
 
 class Document(TimestampMixin, Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_sha256_hash", "sha256_hash"),
+    )
 
     case_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("cases.id"), nullable=False
@@ -33,6 +36,7 @@ class Document(TimestampMixin, Base):
 
     error_code: Mapped[str | None] = mapped_column(String(50), nullable=True)
     # encrypted_pdf | low_quality_image | ocr_failed | unsupported_file | extraction_timeout
+    # | processing_failed
     error_message: Mapped[str | None] = mapped_column(String(500), nullable=True)
     # Turkish human-readable error message
 
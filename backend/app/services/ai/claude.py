@@ -26,6 +26,33 @@ Do not include any other text."""
 
 MAX_TEXT_CHARS = 2000
 
+CLASSIFICATION_MODEL = "claude-sonnet-4-5-20250514"
+
+
+def _build_user_prompt(filename: str, first_page_text: str) -> str:
+    return (
+        f"Filename: {filename}\n\n"
+        f"First page text (truncated):\n{first_page_text[:MAX_TEXT_CHARS]}"
+    )
+
+
+def _parse_response(response_text: str) -> ClassificationResult | None:
+    """Parse Claude's JSON answer; None if the doc_type is invalid."""
+    data = json.loads(response_text.strip())
+
+    doc_type = data.get("doc_type", "")
+    confidence = float(data.get("confidence", 0.0))
+
+    if doc_type not in VALID_DOC_TYPES:
+        logger.warning("Claude returned invalid doc_type: %s", doc_type)
+        return None
+
+    return ClassificationResult(
+        doc_type=doc_type,
+        confidence=min(confidence, 1.0),
+        method="llm",
+    )
+
 
 class ClaudeClassifier(AIService):
     """Classifies documents using Claude API."""
@@ -39,35 +66,21 @@ class ClaudeClassifier(AIService):
 
             client = anthropic.Anthropic(api_key=self._api_key)
 
-            user_prompt = (
-                f"Filename: {filename}\n\n"
-                f"First page text (truncated):\n{first_page_text[:MAX_TEXT_CHARS]}"
-            )
-
             message = client.messages.create(
-                model="claude-sonnet-4-5-20250514",
+                model=CLASSIFICATION_MODEL,
                 max_tokens=100,
                 system=SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": user_prompt}],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": _build_user_prompt(filename, first_page_text),
+                    }
+                ],
             )
 
-            # Parse response
-            response_text = message.content[0].text.strip()
-            data = json.loads(response_text)
-
-            doc_type = data.get("doc_type", "")
-            confidence = float(data.get("confidence", 0.0))
-
-            if doc_type not in VALID_DOC_TYPES:
-                logger.warning("Claude returned invalid doc_type: %s", doc_type)
-                return None
-
-            return ClassificationResult(
-                doc_type=doc_type,
-                confidence=min(confidence, 1.0),
-                method="llm",
-            )
+            return _parse_response(message.content[0].text)
 
         except Exception as exc:
             logger.warning("Claude classification failed: %s", exc)
             return None
+
@@ -1,5 +1,6 @@
 """
-Claude-powered field extraction — page-by-page for cost optimization.
+Claude-powered field extraction — short pages are packed into one call
+for cost optimization.
 
 Contract:
 - Extract ONLY values that exist in the document text.
@@ -9,12 +10,19 @@ Contract:
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
-from app.services.ai.field_mapping import DOC_TYPE_FIELDS
+from app.services.ai.field_mapping import DOC_TYPE_FIELD_SETS, DOC_TYPE_FIELDS
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # stdlib fallback — orjson is a speed-up only
+    from json import loads as json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +32,22 @@ Extract ONLY values that exist in the document text.
 Do NOT generate, estimate, or infer values not present.
 Return a JSON array of extracted fields."""
 
-MAX_PAGE_CHARS = 8000
+EXTRACTION_MODEL = "claude-sonnet-4-5-20250929"
+
+# Per-page text budget, in estimated tokens
+MAX_PAGE_TOKENS = 6000
+# Pages below this many tokens carry no extractable data
+MIN_PAGE_TOKENS = 20
+# Input budget per call: packed page text plus the doc_type's fixed
+# prompt overhead (priced once with count_tokens)
+MAX_CALL_TOKENS = 6500
+# UTF-8 bytes per token for the local page estimate. Latin text averages
+# ~4 and CJK ~3, so 3 over-estimates rather than overflows the budget
+BYTES_PER_TOKEN = 3
+# In-flight Claude calls per document (stay under the RPM limit)
+MAX_CONCURRENT_CALLS = 8
+# Once every key has a match at or above this, remaining pages are skipped
+SATURATION_CONFIDENCE = 0.9
 
 
 @dataclass
@@ -57,49 +80,155 @@ class ExtractionOutput:
     usage: ExtractionUsage = field(default_factory=ExtractionUsage)
 
 
-def _build_user_prompt(
-    doc_type: str, page_no: int, page_text: str, keys: list[str]
-) -> str:
-    truncated = page_text[:MAX_PAGE_CHARS]
-    keys_str = ", ".join(keys)
-    return (
-        f"Document type: {doc_type}. Page {page_no} text:\n"
-        f'"""{truncated}"""\n\n'
-        f"Extract these fields: {keys_str}.\n"
-        f"For each field found, return:\n"
-        f'{{ "canonical_key": "...", "value": "...", '
-        f'"unit": "...", "confidence": 0.0-1.0, '
-        f'"page_no": {page_no}, '
-        f'"snippet_text": "exact quote from document, '
-        f'max 200 chars" }}.\n\n'
-        f"If a field is not found on this page, "
-        f"omit it from the result.\n"
-        f"Return ONLY valid JSON array, no markdown, "
-        f"no explanation."
+PromptBuilder = Callable[[list[tuple[int, str]]], str]
+
+
+def _make_prompt_builder(doc_type: str, keys: list[str]) -> PromptBuilder:
+    """
+    Specialise the user prompt for one doc_type.
+
+    Everything except the page text and page_no hint is rendered once, so
+    the per-call work is a few concatenations and the instruction tail is
+    byte-identical for every request of this doc_type.
+    """
+    prefix = f"Document type: {doc_type}. "
+    tail_head = (
+        f"Extract these fields: {', '.join(keys)}.\n"
+        "For each field found, return:\n"
+        '{ "canonical_key": "...", "value": "...", '
+        '"unit": "...", "confidence": 0.0-1.0, '
+        '"page_no": '
     )
+    tail_rest = (
+        ", "
+        '"snippet_text": "exact quote from document, '
+        'max 200 chars" }.\n\n'
+        "If a field is not found on this page, "
+        "omit it from the result.\n"
+        "Return ONLY valid JSON array, no markdown, "
+        "no explanation."
+    )
+    multi_page_hint = "<number of the PAGE the snippet is on>"
+
+    def build(pages: list[tuple[int, str]]) -> str:
+        """Prompt for one page, or several short pages packed together."""
+        if len(pages) == 1:
+            page_no, page_text = pages[0]
+            return (
+                f'{prefix}Page {page_no} text:\n"""{page_text}"""\n\n'
+                f"{tail_head}{page_no}{tail_rest}"
+            )
+        pages_block = "".join(
+            f'=== PAGE {page_no} ===\n"""{page_text}"""\n'
+            for page_no, page_text in pages
+        )
+        return (
+            f"{prefix}Text of several pages:\n{pages_block}\n"
+            f"{tail_head}{multi_page_hint}{tail_rest}"
+        )
 
+    return build
 
-def _parse_results(
-    raw_text: str,
-    doc_type: str,
-    page_no: int,
-    valid_keys: set[str],
-) -> list[ExtractionResult]:
-    """Parse Claude's JSON response into ExtractionResult list."""
-    # Strip markdown fences if present
+
+# One specialised builder per doc_type, built at import
+_PROMPT_BUILDERS: dict[str, PromptBuilder] = {
+    doc_type: _make_prompt_builder(doc_type, keys)
+    for doc_type, keys in DOC_TYPE_FIELDS.items()
+}
+
+
+async def _count_tokens(client, user_prompt: str) -> int:
+    """Input tokens for one extraction request (system + user prompt)."""
+    count = await client.messages.count_tokens(
+        model=EXTRACTION_MODEL,
+        system=SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": user_prompt}],
+    )
+    return count.input_tokens
+
+
+# Fixed prompt overhead per doc_type (system prompt + instructions)
+_overhead_tokens: dict[str, int] = {}
+
+
+async def _prompt_overhead(
+    client, doc_type: str, build_prompt: PromptBuilder
+) -> int:
+    """
+    Tokens of everything but the page text for doc_type.
+
+    Counted once per doc_type and cached. Falls back to a local estimate
+    (not cached) when the count_tokens endpoint is unavailable.
+    """
+    cached = _overhead_tokens.get(doc_type)
+    if cached is not None:
+        return cached
+    prompt = build_prompt([(0, "")])
+    try:
+        tokens = await _count_tokens(client, prompt)
+    except Exception as exc:
+        logger.warning("Token counting unavailable: %s", exc)
+        return _estimate_tokens(SYSTEM_PROMPT + prompt)
+    _overhead_tokens[doc_type] = tokens
+    return tokens
+
+
+def _estimate_tokens(text: str) -> int:
+    """Conservative local token estimate from UTF-8 length."""
+    return -(-len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+
+
+def _fit_page_text(page_text: str) -> tuple[str, int] | None:
+    """
+    Truncate page text to MAX_PAGE_TOKENS.
+
+    Returns (text, estimated_tokens), or None if the page is below
+    MIN_PAGE_TOKENS (not worth a call).
+    """
+    tokens = _estimate_tokens(page_text)
+    if tokens < MIN_PAGE_TOKENS:
+        return None
+    if tokens <= MAX_PAGE_TOKENS:
+        return page_text, tokens
+
+    limit = MAX_PAGE_TOKENS * BYTES_PER_TOKEN
+    # "ignore" drops a multi-byte character split at the cut
+    return page_text.encode("utf-8")[:limit].decode("utf-8", "ignore"), MAX_PAGE_TOKENS
+
+
+def _pack_pages(
+    fitted: list[tuple[int, str, int]],
+    budget: int,
+) -> list[list[tuple[int, str]]]:
+    """
+    Group consecutive (page_no, text, tokens) into batches of at most
+    budget tokens, so short pages share one call and one system prompt.
+    """
+    batches: list[list[tuple[int, str]]] = []
+    batch: list[tuple[int, str]] = []
+    batch_tokens = 0
+    for page_no, text, tokens in fitted:
+        if batch and batch_tokens + tokens > budget:
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append((page_no, text))
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _parse_response(raw_text: str, page_no: int) -> list[dict]:
+    """Field objects from Claude's JSON array response (fences stripped)."""
     text = raw_text.strip()
     if text.startswith("```"):
-        lines = text.split("\n")
-        # Remove first and last lines (fences)
-        lines = [
-            ln
-            for ln in lines
-            if not ln.strip().startswith("```")
-        ]
-        text = "\n".join(lines)
+        text = "\n".join(
+            ln for ln in text.split("\n") if not ln.strip().startswith("```")
+        )
 
     try:
-        data = json.loads(text)
+        data = json_loads(text)
     except json.JSONDecodeError:
         logger.warning(
             "Malformed JSON from Claude on page %d: %.100s",
@@ -110,61 +239,71 @@ def _parse_results(
 
     if not isinstance(data, list):
         data = [data]
+    return [item for item in data if isinstance(item, dict)]
 
-    results: list[ExtractionResult] = []
-    for item in data:
-        if not isinstance(item, dict):
-            continue
 
-        key = item.get("canonical_key", "")
-        value = str(item.get("value", "")).strip()
-        snippet = str(item.get("snippet_text", "")).strip()
-
-        # Validation: key must be valid, value and snippet required
-        if key not in valid_keys:
-            logger.debug(
-                "Discarding invalid key '%s' for %s", key, doc_type
-            )
-            continue
-        if not value:
-            logger.debug("Discarding empty value for key '%s'", key)
-            continue
-        if not snippet:
-            logger.debug(
-                "Discarding key '%s' — no snippet (no evidence)",
-                key,
-            )
-            continue
-
-        confidence = float(item.get("confidence", 0.5))
-        confidence = max(0.0, min(1.0, confidence))
-
-        unit = item.get("unit")
-        if unit is not None:
-            unit = str(unit).strip() or None
-
-        results.append(
-            ExtractionResult(
-                canonical_key=key,
-                value=value,
-                unit=unit,
-                page=item.get("page_no", page_no),
-                snippet=snippet[:200],
-                confidence=confidence,
-            )
+def _parse_item(
+    item: dict,
+    doc_type: str,
+    page_no: int,
+    valid_keys: frozenset[str],
+) -> ExtractionResult | None:
+    """Validate one field object from Claude's response."""
+    key = item.get("canonical_key", "")
+    value = str(item.get("value", "")).strip()
+    snippet = str(item.get("snippet_text", "")).strip()
+
+    # Validation: key must be valid, value and snippet required
+    if key not in valid_keys:
+        logger.debug(
+            "Discarding invalid key '%s' for %s", key, doc_type
+        )
+        return None
+    if not value:
+        logger.debug("Discarding empty value for key '%s'", key)
+        return None
+    if not snippet:
+        logger.debug(
+            "Discarding key '%s' — no snippet (no evidence)",
+            key,
         )
+        return None
+
+    confidence = float(item.get("confidence", 0.5))
+    confidence = max(0.0, min(1.0, confidence))
 
-    return results
+    unit = item.get("unit")
+    if unit is not None:
+        unit = str(unit).strip() or None
+
+    # Packed prompts cover several pages — trust only integer page_no
+    try:
+        page = int(item.get("page_no", page_no))
+    except (TypeError, ValueError):
+        page = page_no
+
+    return ExtractionResult(
+        canonical_key=key,
+        value=value,
+        unit=unit,
+        page=page,
+        snippet=snippet[:200],
+        confidence=confidence,
+    )
 
 
 def _deduplicate(
     results: list[ExtractionResult],
 ) -> list[ExtractionResult]:
-    """Keep highest-confidence result per canonical_key."""
+    """Keep highest-confidence result per canonical_key.
+
+    Single pass over the input: keys keep their first-seen order and the
+    earliest result wins on ties.
+    """
     best: dict[str, ExtractionResult] = {}
     for r in results:
-        existing = best.get(r.canonical_key)
-        if existing is None or r.confidence > existing.confidence:
+        existing = best.setdefault(r.canonical_key, r)
+        if r.confidence > existing.confidence:
             best[r.canonical_key] = r
     return list(best.values())
 
@@ -174,13 +313,61 @@ def snippet_hash(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-class ClaudeExtractor:
-    """Extracts fields from document pages using Claude API."""
+def extraction_fingerprint(doc_type: str, pages: list[tuple[int, str]]) -> str:
+    """
+    SHA256 of everything that determines the extraction requests for a
+    document: model, system prompt, doc_type and the rendered user prompt.
+
+    Changes whenever any of them does, so callers can key result caches
+    on it.
+    """
+    build_prompt = _PROMPT_BUILDERS.get(doc_type)
+    prompt = build_prompt(pages) if build_prompt else repr(pages)
+    h = hashlib.sha256()
+    for part in (EXTRACTION_MODEL, SYSTEM_PROMPT, doc_type, prompt):
+        data = part.encode()
+        # Length-prefix each part so boundaries can't collide
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+class AsyncClaudeExtractor:
+    """
+    Extracts fields from document pages using the async Claude API.
+
+    Page token counts and page batches are fanned out concurrently on one
+    event loop (bounded by MAX_CONCURRENT_CALLS), instead of blocking a
+    thread per in-flight request.
+
+    One client is kept per event loop, so documents extracted concurrently
+    on the same loop share its keep-alive connection pool.
+    """
 
     def __init__(self, api_key: str):
         self._api_key = api_key
+        self._client = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
 
-    def extract_fields(
+    def _get_client(self):
+        """AsyncAnthropic client bound to the running event loop."""
+        import anthropic
+
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # httpx pools are tied to the loop they were opened on
+            self._client = anthropic.AsyncAnthropic(api_key=self._api_key)
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the cached client and its connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._client_loop = None
+
+    async def extract_fields(
         self,
         doc_type: str,
         pages: list[tuple[int, str]],
@@ -196,58 +383,125 @@ class ClaudeExtractor:
             ExtractionOutput with deduplicated results and
             token usage metadata.
         """
-        import anthropic
-
-        valid_keys_list = DOC_TYPE_FIELDS.get(doc_type, [])
-        if not valid_keys_list:
+        build_prompt = _PROMPT_BUILDERS.get(doc_type)
+        if build_prompt is None:
             logger.warning("No field mapping for doc_type: %s", doc_type)
             return ExtractionOutput()
 
-        valid_keys = set(valid_keys_list)
-        client = anthropic.Anthropic(api_key=self._api_key)
+        valid_keys = DOC_TYPE_FIELD_SETS[doc_type]
+        client = self._get_client()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+
+        # Fixed prompt overhead: one count_tokens call per doc_type per
+        # process; page text is estimated locally
+        overhead_tokens = await _prompt_overhead(client, doc_type, build_prompt)
 
-        all_results: list[ExtractionResult] = []
         usage = ExtractionUsage()
+        found_high_conf: set[str] = set()
 
+        fitted: list[tuple[int, str, int]] = []
         for page_no, page_text in pages:
-            if not page_text or not page_text.strip():
+            fit = (
+                _fit_page_text(page_text)
+                if page_text and page_text.strip()
+                else None
+            )
+            if fit is None:
                 usage.pages_skipped += 1
                 continue
+            fitted.append((page_no, *fit))
+
+        async def extract_batch(
+            batch: list[tuple[int, str]],
+        ) -> list[ExtractionResult]:
+            first_page = batch[0][0]
+            batch_results: list[ExtractionResult] = []
+            user_prompt = build_prompt(batch)
+
+            async with semaphore:
+                try:
+                    message = await client.messages.create(
+                        model=EXTRACTION_MODEL,
+                        max_tokens=2048,
+                        system=SYSTEM_PROMPT,
+                        messages=[
+                            {"role": "user", "content": user_prompt}
+                        ],
+                    )
+                    for item in _parse_response(message.content[0].text, first_page):
+                        result = _parse_item(item, doc_type, first_page, valid_keys)
+                        if result is None:
+                            continue
+                        batch_results.append(result)
+                        if result.confidence >= SATURATION_CONFIDENCE:
+                            found_high_conf.add(result.canonical_key)
+
+                    usage.input_tokens += message.usage.input_tokens
+                    usage.output_tokens += message.usage.output_tokens
+                    usage.pages_processed += len(batch)
+
+                except Exception as exc:
+                    logger.error(
+                        "Claude extraction failed on pages %s: %s",
+                        [page_no for page_no, _ in batch],
+                        exc,
+                    )
+                    usage.pages_skipped += len(batch)
+
+            return batch_results
+
+        # The first batch runs alone, then the rest go out in waves of
+        # MAX_CONCURRENT_CALLS. Saturation is checked before each wave: once
+        # every key has a high-confidence match, later pages could only add
+        # lower-ranked duplicates and are not sent.
+        batches = _pack_pages(fitted, MAX_CALL_TOKENS - overhead_tokens)
+        waves = [batches[:1]] + [
+            batches[i : i + MAX_CONCURRENT_CALLS]
+            for i in range(1, len(batches), MAX_CONCURRENT_CALLS)
+        ]
+        all_results: list[ExtractionResult] = []
+        for n, wave in enumerate(waves):
+            if found_high_conf >= valid_keys:
+                usage.pages_skipped += sum(
+                    len(batch) for rest in waves[n:] for batch in rest
+                )
+                break
+            # Merge in page order so dedup ties are deterministic
+            for results in await asyncio.gather(
+                *(extract_batch(batch) for batch in wave)
+            ):
+                all_results.extend(results)
 
-            user_prompt = _build_user_prompt(
-                doc_type, page_no, page_text, valid_keys_list
-            )
+        # Deduplicate: same key on multiple pages → highest confidence
+        deduplicated = _deduplicate(all_results)
 
-            try:
-                message = client.messages.create(
-                    model="claude-sonnet-4-5-20250929",
-                    max_tokens=2048,
-                    system=SYSTEM_PROMPT,
-                    messages=[
-                        {"role": "user", "content": user_prompt}
-                    ],
-                )
+        return ExtractionOutput(results=deduplicated, usage=usage)
 
-                usage.input_tokens += message.usage.input_tokens
-                usage.output_tokens += message.usage.output_tokens
-                usage.pages_processed += 1
 
-                response_text = message.content[0].text
-                page_results = _parse_results(
-                    response_text, doc_type, page_no, valid_keys
-                )
-                all_results.extend(page_results)
+class ClaudeExtractor:
+    """
+    Extracts fields from document pages using Claude API.
 
-            except Exception as exc:
-                logger.error(
-                    "Claude extraction failed on page %d: %s",
-                    page_no,
-                    exc,
-                )
-                usage.pages_skipped += 1
-                continue
+    Blocking wrapper around AsyncClaudeExtractor for sync callers (the
+    pipeline, CLI scripts). Must not be called from a running event loop
+    — await AsyncClaudeExtractor.extract_fields there instead.
+    """
 
-        # Deduplicate: same key on multiple pages → highest confidence
-        deduplicated = _deduplicate(all_results)
+    def __init__(self, api_key: str):
+        self._async = AsyncClaudeExtractor(api_key=api_key)
 
-        return ExtractionOutput(results=deduplicated, usage=usage)
+    def extract_fields(
+        self,
+        doc_type: str,
+        pages: list[tuple[int, str]],
+    ) -> ExtractionOutput:
+        """Extract fields from document pages (see AsyncClaudeExtractor)."""
+
+        async def run() -> ExtractionOutput:
+            # The loop ends with this call; close its client with it
+            try:
+                return await self._async.extract_fields(doc_type, pages)
+            finally:
+                await self._async.aclose()
+
+        return asyncio.run(run())
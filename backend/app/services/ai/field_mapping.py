@@ -3,6 +3,7 @@ Canonical field definitions per document type.
 
 Pure-data module — no logic, no imports beyond stdlib.
 Used by ClaudeExtractor (prompt building) and frontend (labels/grouping).
+Reverse indexes at the bottom are derived once at import for O(1) lookups.
 """
 
 # --- Canonical keys expected per doc_type ---
@@ -125,3 +126,14 @@ FIELD_CATEGORIES: dict[str, list[str]] = {
         "customs.hs_code",
     ],
 }
+
+# --- Reverse indexes, built once at import ---
+FIELD_TO_CATEGORY: dict[str, str] = {
+    key: category
+    for category, keys in FIELD_CATEGORIES.items()
+    for key in keys
+}
+
+DOC_TYPE_FIELD_SETS: dict[str, frozenset[str]] = {
+    doc_type: frozenset(keys) for doc_type, keys in DOC_TYPE_FIELDS.items()
+}
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import re
+
 from app.services.ai.base import AIService, ClassificationResult
 
 # Keywords for each document type, ordered by specificity
@@ -57,33 +59,69 @@ FILENAME_CONFIDENCE = 0.85
 TEXT_CONFIDENCE = 0.90
 
 
+def _compile_keywords(keywords: list[str]) -> re.Pattern[str]:
+    """One case-insensitive scan per doc_type, longest keyword first.
+
+    The zero-width lookahead reports a match at every position, so keywords
+    that overlap or share a prefix are not swallowed by a longer match.
+    """
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile(
+        "(?=(" + "|".join(re.escape(kw) for kw in ordered) + "))",
+        re.IGNORECASE,
+    )
+
+
+# Precompiled at import — one pattern per doc_type
+_KEYWORD_PATTERNS: dict[str, re.Pattern[str]] = {
+    doc_type: _compile_keywords(keywords)
+    for doc_type, keywords in KEYWORD_MAP.items()
+}
+
+# Matched keyword → keywords of the same doc_type it contains (incl. itself).
+# A shorter keyword starting where a longer one matched is always a prefix
+# of it, so this recovers every distinct keyword present in the text.
+_CONTAINED: dict[str, dict[str, frozenset[str]]] = {
+    doc_type: {
+        kw: frozenset(other for other in keywords if other in kw)
+        for kw in keywords
+    }
+    for doc_type, keywords in KEYWORD_MAP.items()
+}
+
+
+def _count_keywords(doc_type: str, text: str) -> int:
+    """Number of distinct keywords of doc_type present in text."""
+    contained = _CONTAINED[doc_type]
+    found: set[str] = set()
+    for match in _KEYWORD_PATTERNS[doc_type].finditer(text):
+        found |= contained[match.group(1).lower()]
+    return len(found)
+
+
 class HeuristicClassifier(AIService):
     """Classifies documents using keyword matching on filename and first-page text."""
 
     def classify(self, filename: str, first_page_text: str) -> ClassificationResult | None:
-        fn_lower = filename.lower()
-        text_lower = first_page_text.lower()
-
         # Score each doc_type
         best_type: str | None = None
         best_score = 0
         best_confidence = 0.0
 
-        for doc_type, keywords in KEYWORD_MAP.items():
-            score = 0
+        for doc_type in KEYWORD_MAP:
             source_confidence = 0.0
 
-            # Check filename
-            for kw in keywords:
-                if kw in fn_lower:
-                    score += 2  # filename match is weighted
-                    source_confidence = max(source_confidence, FILENAME_CONFIDENCE)
+            # Check filename (filename match is weighted)
+            fn_hits = _count_keywords(doc_type, filename)
+            if fn_hits:
+                source_confidence = FILENAME_CONFIDENCE
 
             # Check first page text
-            for kw in keywords:
-                if kw in text_lower:
-                    score += 1
-                    source_confidence = max(source_confidence, TEXT_CONFIDENCE)
+            text_hits = _count_keywords(doc_type, first_page_text)
+            if text_hits:
+                source_confidence = TEXT_CONFIDENCE
+
+            score = fn_hits * 2 + text_hits
 
             if score > best_score:
                 best_score = score
@@ -13,6 +13,7 @@ evidence anchors, API responses, frontend) without API costs.
 from __future__ import annotations
 
 import csv
+import functools
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -53,8 +54,13 @@ class GroundTruthEntry:
     expected_snippet_contains: str
 
 
+@functools.lru_cache(maxsize=1)
 def _load_ground_truth() -> dict[str, list[GroundTruthEntry]]:
-    """Load and group ground truth by doc_type."""
+    """Load and group ground truth by doc_type.
+
+    Parsed on first use and cached for the process lifetime, so importing
+    this module (or never using MockExtractor) costs no CSV read.
+    """
     if not GROUND_TRUTH_PATH.exists():
         logger.warning(
             "Ground truth CSV not found: %s",
@@ -84,10 +90,6 @@ def _load_ground_truth() -> dict[str, list[GroundTruthEntry]]:
     return by_type
 
 
-# Pre-load at module level
-_GROUND_TRUTH = _load_ground_truth()
-
-
 class MockExtractor:
     """
     Returns hardcoded extraction results from ground truth CSV.
@@ -101,7 +103,7 @@ class MockExtractor:
         doc_type: str,
         pages: list[tuple[int, str]],
     ) -> ExtractionOutput:
-        gt_entries = _GROUND_TRUTH.get(doc_type, [])
+        gt_entries = _load_ground_truth().get(doc_type, [])
         if not gt_entries:
             logger.warning(
                 "MockExtractor: no ground truth for doc_type=%s",
@@ -6,6 +6,18 @@ from sqlalchemy.orm import Session
 
 from app.models.audit_log import AuditLog
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback — orjson is a speed-up only
+    orjson = None
+
+
+def _dumps(metadata: dict[str, Any]) -> str:
+    """Serialize audit metadata; UUIDs and datetimes become strings."""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata, default=str)
+
 
 def write_audit(
     db: Session,
@@ -24,7 +36,7 @@ def write_audit(
         action=action,
         entity_type=entity_type,
         entity_id=entity_id,
-        metadata_json=json.dumps(metadata) if metadata else None,
+        metadata_json=_dumps(metadata) if metadata else None,
     )
     db.add(entry)
     return entry
@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
+import functools
 import io
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 # Minimum characters on a PDF page before we try OCR fallback
 MIN_TEXT_CHARS = 50
 
+# OCR fallback concurrency: worker threads, and max rendered pages held at once
+OCR_MAX_WORKERS = os.cpu_count() or 1
+OCR_MAX_INFLIGHT = 32
+
+# PDF page OCR: render resolution, and Tesseract LSTM engine + single text block layout
+OCR_DPI = 200
+PDF_OCR_CONFIG = "--oem 1 --psm 6"
+
+# Images smaller than this on their longest side are upscaled 2x before OCR
+OCR_UPSCALE_BELOW_PX = 1024
+
 
 class ExtractionError(Exception):
     """Raised when text extraction fails."""
@@ -31,35 +46,46 @@ class PageText:
     method: str  # "pdfplumber" | "tesseract"
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> list[PageText]:
+def extract_text_from_pdf(source: bytes | Path) -> list[PageText]:
     """
     Extract text from a PDF using PyMuPDF (fitz).
-    Falls back to OCR via Tesseract for pages with < MIN_TEXT_CHARS characters.
+    Falls back to OCR via Tesseract for pages with < MIN_TEXT_CHARS characters
+    that contain images or drawings.
+
+    ``source`` is the file content or a local path; a path lets PyMuPDF read
+    pages from disk instead of holding the whole file in memory.
 
     Raises ExtractionError if the PDF is encrypted or cannot be read.
     """
     import fitz  # PyMuPDF
 
     try:
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
+        if isinstance(source, Path):
+            doc = fitz.open(source, filetype="pdf")
+        else:
+            doc = fitz.open(stream=source, filetype="pdf")
     except Exception as exc:
         raise ExtractionError("unsupported_file", f"Cannot open PDF: {exc}") from exc
 
-    if doc.is_encrypted:
-        doc.close()
-        raise ExtractionError(
-            "encrypted_pdf",
-            "PDF file is password-protected. Please remove the password and re-upload.",
-        )
+    with doc:  # closed even if OCR raises
+        if doc.is_encrypted:
+            raise ExtractionError(
+                "encrypted_pdf",
+                "PDF file is password-protected. Please remove the password and re-upload.",
+            )
 
-    pages: list[PageText] = []
+        pages: list[PageText] = []
+        ocr_pending: list[tuple[int, str]] = []  # (index into pages, embedded text)
 
-    for page_idx in range(len(doc)):
-        page = doc[page_idx]
-        text = page.get_text("text").strip()
-        page_number = page_idx + 1
+        for page_idx in range(len(doc)):
+            page = doc[page_idx]
+            text = page.get_text("text").strip()
+            if len(text) < MIN_TEXT_CHARS:
+                text = max(text, _text_from_blocks(page), key=len)
+            page_number = page_idx + 1
 
-        if len(text) >= MIN_TEXT_CHARS:
+            if len(text) < MIN_TEXT_CHARS and _has_visual_content(page):
+                ocr_pending.append((len(pages), text))
             pages.append(
                 PageText(
                     page_number=page_number,
@@ -68,45 +94,130 @@ def extract_text_from_pdf(file_bytes: bytes) -> list[PageText]:
                     method="pdfplumber",
                 )
             )
-        else:
-            # Attempt OCR fallback for this page
-            ocr_text = _ocr_pdf_page(page)
-            method = "tesseract" if ocr_text else "pdfplumber"
-            final_text = ocr_text if ocr_text and len(ocr_text) > len(text) else text
-            pages.append(
-                PageText(
-                    page_number=page_number,
+
+        if ocr_pending:
+            _ocr_pdf_pages(doc, pages, ocr_pending)
+
+    if not pages:
+        raise ExtractionError("ocr_failed", "PDF contains no pages.")
+
+    return pages
+
+
+def _text_from_blocks(page) -> str:
+    """
+    Second pass over the embedded text layer using block extraction.
+
+    Block mode groups text by layout region and can recover text the plain
+    "text" pass misses, which is still far cheaper than raster OCR.
+    """
+    blocks = page.get_text("blocks")
+    # Block tuples: (x0, y0, x1, y1, text, block_no, block_type); type 1 is an image
+    return "\n".join(b[4].strip() for b in blocks if b[6] == 0 and b[4].strip())
+
+
+def _has_visual_content(page) -> bool:
+    """
+    True if a page has raster images or vector drawings that OCR could read.
+
+    Low-text pages with neither (blank, separator pages) skip the OCR fallback.
+    """
+    return bool(page.get_images(full=False)) or bool(page.get_cdrawings())
+
+
+def _ocr_pdf_pages(doc, pages: list[PageText], pending: list[tuple[int, str]]) -> None:
+    """
+    Run the OCR fallback for low-text pages concurrently, updating ``pages`` in place.
+
+    Rendering stays on the calling thread (fitz documents are not thread-safe);
+    Tesseract runs as a subprocess, so a thread pool overlaps the OCR itself.
+    Pages are handled in windows of OCR_MAX_INFLIGHT to bound rendered-image memory.
+    """
+    with ThreadPoolExecutor(max_workers=OCR_MAX_WORKERS) as pool:
+        for start in range(0, len(pending), OCR_MAX_INFLIGHT):
+            window = pending[start : start + OCR_MAX_INFLIGHT]
+            futures = [
+                pool.submit(_ocr_page_image, _render_pdf_page(doc[pages[idx].page_number - 1]))
+                for idx, _ in window
+            ]
+            for (idx, text), future in zip(window, futures):
+                ocr_text = future.result()
+                method = "tesseract" if ocr_text else "pdfplumber"
+                final_text = ocr_text if ocr_text and len(ocr_text) > len(text) else text
+                pages[idx] = PageText(
+                    page_number=pages[idx].page_number,
                     text=final_text,
                     char_count=len(final_text),
                     method=method,
                 )
-            )
 
-    doc.close()
 
-    if not pages:
-        raise ExtractionError("ocr_failed", "PDF contains no pages.")
+def _render_pdf_page(page):
+    """Render a PDF page to a grayscale PIL image at OCR_DPI for OCR."""
+    try:
+        import fitz  # PyMuPDF
+        from PIL import Image
 
-    return pages
+        pix = page.get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY, alpha=False)
+        # Raw samples straight into PIL — no PNG encode/decode round trip
+        return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    except Exception as exc:
+        logger.warning("OCR fallback failed for page: %s", exc)
+        return None
 
 
-def _ocr_pdf_page(page) -> str:
-    """OCR a single PDF page by rendering it to an image and running Tesseract."""
+def _ocr_page_image(img) -> str:
+    """Run Tesseract on a rendered page image."""
+    if img is None:
+        return ""
     try:
         import pytesseract
-        from PIL import Image
 
-        # Render page to image at 300 DPI
-        pix = page.get_pixmap(dpi=300)
-        img = Image.open(io.BytesIO(pix.tobytes("png")))
-        text = pytesseract.image_to_string(img).strip()
+        img = _preprocess_for_ocr(img)
+        text = pytesseract.image_to_string(img, config=PDF_OCR_CONFIG).strip()
         return text
     except Exception as exc:
         logger.warning("OCR fallback failed for page: %s", exc)
         return ""
 
 
-def extract_text_from_image(file_bytes: bytes) -> list[PageText]:
+@functools.lru_cache(maxsize=1)
+def _load_opencv():
+    """Import (cv2, numpy) once; None when they are not installed.
+
+    Cached so a missing optional dependency is not re-searched on sys.path
+    for every OCR'd page.
+    """
+    try:
+        import cv2
+        import numpy as np
+    except ImportError:
+        return None
+    return cv2, np
+
+
+def _preprocess_for_ocr(img):
+    """
+    Clean up an image before Tesseract: grayscale, 2x upscale for small
+    images, then Otsu binarization. Returns the image unchanged when
+    OpenCV/numpy are not installed.
+    """
+    opencv = _load_opencv()
+    if opencv is None:
+        return img
+    cv2, np = opencv
+
+    from PIL import Image
+
+    gray = np.asarray(img.convert("L"))
+    h, w = gray.shape
+    if max(w, h) < OCR_UPSCALE_BELOW_PX:
+        gray = cv2.resize(gray, (w * 2, h * 2), interpolation=cv2.INTER_CUBIC)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    return Image.fromarray(binary)
+
+
+def extract_text_from_image(source: bytes | Path) -> list[PageText]:
     """
     Extract text from an image (JPEG/PNG) using Tesseract OCR.
 
@@ -116,7 +227,8 @@ def extract_text_from_image(file_bytes: bytes) -> list[PageText]:
         import pytesseract
         from PIL import Image
 
-        img = Image.open(io.BytesIO(file_bytes))
+        img = Image.open(source if isinstance(source, Path) else io.BytesIO(source))
+        img = _preprocess_for_ocr(img)
         text = pytesseract.image_to_string(img).strip()
 
         if not text:
@@ -142,7 +254,7 @@ def extract_text_from_image(file_bytes: bytes) -> list[PageText]:
         ) from exc
 
 
-def extract_text(file_bytes: bytes, mime_type: str) -> list[PageText]:
+def extract_text(source: bytes | Path, mime_type: str) -> list[PageText]:
     """
     Main entry point: routes to the correct extraction method based on MIME type.
 
@@ -150,9 +262,9 @@ def extract_text(file_bytes: bytes, mime_type: str) -> list[PageText]:
     Raises ExtractionError on failure.
     """
     if mime_type == "application/pdf":
-        return extract_text_from_pdf(file_bytes)
+        return extract_text_from_pdf(source)
     elif mime_type in ("image/jpeg", "image/png"):
-        return extract_text_from_image(file_bytes)
+        return extract_text_from_image(source)
     else:
         raise ExtractionError(
             "unsupported_file",
@@ -5,6 +5,7 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, datetime
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.case import Case
@@ -23,76 +24,9 @@ REQUIRED_FIELDS = [
 ]
 
 
-def compute_evidence_coverage(db: Session, case_id: uuid.UUID) -> float:
-    """
-    (required_fields with >=1 evidence_anchor) / total_required_fields * 100.
-
-    Checks if each required canonical_key exists as an ExtractedField
-    for this case and has at least one EvidenceAnchor.
-    """
-    covered = 0
-    for key in REQUIRED_FIELDS:
-        field = (
-            db.query(ExtractedField)
-            .filter(
-                ExtractedField.case_id == case_id,
-                ExtractedField.canonical_key == key,
-                ExtractedField.status != "rejected",
-            )
-            .first()
-        )
-        if field:
-            anchor_count = (
-                db.query(EvidenceAnchor)
-                .filter(EvidenceAnchor.field_id == field.id)
-                .count()
-            )
-            if anchor_count >= 1:
-                covered += 1
-
-    total = len(REQUIRED_FIELDS)
-    return round(covered / total * 100, 1) if total > 0 else 0.0
-
-
-def compute_conflict_rate(db: Session, case_id: uuid.UUID) -> float:
-    """(fields with status=conflict) / (total extracted fields) * 100."""
-    total = (
-        db.query(ExtractedField)
-        .filter(ExtractedField.case_id == case_id)
-        .count()
-    )
-    if total == 0:
-        return 0.0
-
-    conflicts = (
-        db.query(ExtractedField)
-        .filter(
-            ExtractedField.case_id == case_id,
-            ExtractedField.status == "conflict",
-        )
-        .count()
-    )
-    return round(conflicts / total * 100, 1)
-
-
-def compute_days_to_ready(db: Session, case: Case) -> float | None:
-    """
-    Simplified MVP: days from first document upload to now.
-
-    Returns None if no documents have been uploaded yet.
-    """
-    first_doc = (
-        db.query(Document)
-        .filter(Document.case_id == case.id)
-        .order_by(Document.created_at.asc())
-        .first()
-    )
-    if not first_doc or not first_doc.created_at:
-        return None
-
+def _days_since(first_upload: datetime) -> float:
     now = datetime.now(UTC)
     # Handle naive datetimes from SQLite
-    first_upload = first_doc.created_at
     if first_upload.tzinfo is None:
         first_upload = first_upload.replace(tzinfo=UTC)
 
@@ -104,57 +38,118 @@ def compute_case_metrics(
     db: Session, case: Case
 ) -> CaseMetricsResponse:
     """Aggregate all metrics for a single case."""
-    case_id = case.id
+    return compute_cases_metrics(db, [case])[case.id]
 
-    # Field counts
-    all_fields = (
+
+def compute_cases_metrics(
+    db: Session, cases: list[Case]
+) -> dict[uuid.UUID, CaseMetricsResponse]:
+    """
+    Aggregate metrics for several cases at once, keyed by case id.
+
+    Issues the same four queries as a single-case call, each covering
+    every requested case.
+    """
+    case_ids = [c.id for c in cases]
+    if not case_ids:
+        return {}
+
+    # Field rows, grouped per case
+    fields_by_case: dict[uuid.UUID, list[ExtractedField]] = {
+        case_id: [] for case_id in case_ids
+    }
+    for f in (
         db.query(ExtractedField)
-        .filter(ExtractedField.case_id == case_id)
+        .filter(ExtractedField.case_id.in_(case_ids))
+        .all()
+    ):
+        fields_by_case[f.case_id].append(f)
+
+    # Evidence coverage: one anchor lookup over all required fields
+    required_ids = [
+        f.id
+        for fields in fields_by_case.values()
+        for f in fields
+        if f.canonical_key in REQUIRED_FIELDS and f.status != "rejected"
+    ]
+    anchored_ids = set()
+    if required_ids:
+        anchored_ids = {
+            field_id
+            for (field_id,) in db.query(EvidenceAnchor.field_id)
+            .filter(EvidenceAnchor.field_id.in_(required_ids))
+            .distinct()
+        }
+
+    # Checklist counts per (case, status)
+    checklist_counts: dict[tuple[uuid.UUID, str], int] = {
+        (case_id, status): count
+        for case_id, status, count in db.query(
+            ChecklistItem.case_id, ChecklistItem.status, func.count(ChecklistItem.id)
+        )
+        .filter(ChecklistItem.case_id.in_(case_ids))
+        .group_by(ChecklistItem.case_id, ChecklistItem.status)
+    }
+
+    # First upload per case, for days-to-ready
+    first_uploads = dict(
+        db.query(Document.case_id, func.min(Document.created_at))
+        .filter(Document.case_id.in_(case_ids))
+        .group_by(Document.case_id)
         .all()
-    )
-    total_fields = len(all_fields)
-    l1_fields = sum(1 for f in all_fields if f.tier == "L1")
-    l2_fields = sum(1 for f in all_fields if f.tier == "L2")
-    buyer_visible = sum(
-        1 for f in all_fields if f.visibility == "buyer_visible"
     )
 
-    # Required fields present
-    present_keys = {f.canonical_key for f in all_fields}
-    required_present = sum(
-        1 for k in REQUIRED_FIELDS if k in present_keys
-    )
+    results: dict[uuid.UUID, CaseMetricsResponse] = {}
+    for case_id in case_ids:
+        all_fields = fields_by_case[case_id]
+        total_fields = len(all_fields)
+        l1_fields = sum(1 for f in all_fields if f.tier == "L1")
+        l2_fields = sum(1 for f in all_fields if f.tier == "L2")
+        buyer_visible = sum(
+            1 for f in all_fields if f.visibility == "buyer_visible"
+        )
 
-    # Checklist counts
-    checklist_open = (
-        db.query(ChecklistItem)
-        .filter(
-            ChecklistItem.case_id == case_id,
-            ChecklistItem.status == "open",
+        # Required fields present
+        present_keys = {f.canonical_key for f in all_fields}
+        required_present = sum(
+            1 for k in REQUIRED_FIELDS if k in present_keys
         )
-        .count()
-    )
-    checklist_done = (
-        db.query(ChecklistItem)
-        .filter(
-            ChecklistItem.case_id == case_id,
-            ChecklistItem.status == "done",
+
+        # Evidence coverage: required keys with >=1 EvidenceAnchor on a
+        # non-rejected field, as a percentage of REQUIRED_FIELDS
+        covered = len(
+            {
+                f.canonical_key
+                for f in all_fields
+                if f.id in anchored_ids
+                and f.canonical_key in REQUIRED_FIELDS
+                and f.status != "rejected"
+            }
         )
-        .count()
-    )
+        evidence_coverage = round(covered / len(REQUIRED_FIELDS) * 100, 1)
 
-    return CaseMetricsResponse(
-        case_id=case_id,
-        evidence_coverage_pct=compute_evidence_coverage(db, case_id),
-        conflict_rate=compute_conflict_rate(db, case_id),
-        days_to_ready_l1=compute_days_to_ready(db, case),
-        days_to_ready_l2=compute_days_to_ready(db, case),
-        total_fields=total_fields,
-        l1_fields=l1_fields,
-        l2_fields=l2_fields,
-        buyer_visible_fields=buyer_visible,
-        required_fields_present=required_present,
-        required_fields_total=len(REQUIRED_FIELDS),
-        checklist_open=checklist_open,
-        checklist_done=checklist_done,
-    )
+        # Conflict rate: fields with status=conflict / all fields * 100
+        conflicts = sum(1 for f in all_fields if f.status == "conflict")
+        conflict_rate = (
+            round(conflicts / total_fields * 100, 1) if total_fields else 0.0
+        )
+
+        first_upload = first_uploads.get(case_id)
+        days_to_ready = _days_since(first_upload) if first_upload else None
+
+        results[case_id] = CaseMetricsResponse(
+            case_id=case_id,
+            evidence_coverage_pct=evidence_coverage,
+            conflict_rate=conflict_rate,
+            days_to_ready_l1=days_to_ready,
+            days_to_ready_l2=days_to_ready,
+            total_fields=total_fields,
+            l1_fields=l1_fields,
+            l2_fields=l2_fields,
+            buyer_visible_fields=buyer_visible,
+            required_fields_present=required_present,
+            required_fields_total=len(REQUIRED_FIELDS),
+            checklist_open=checklist_counts.get((case_id, "open"), 0),
+            checklist_done=checklist_counts.get((case_id, "done"), 0),
+        )
+    return results
@@ -1,6 +1,7 @@
 """Document processing pipeline orchestrator.
 
 Synchronous MVP pipeline: validate → extract text → classify.
+Documents in a case are processed concurrently, one Session per worker.
 Extraction (AI field extraction) is triggered separately via API.
 Commits after each major step for atomicity.
 """
@@ -9,8 +10,11 @@ from __future__ import annotations
 
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-from sqlalchemy.orm import Session
+from sqlalchemy import case as sa_case
+from sqlalchemy import func
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.models.case import Case
 from app.models.document import Document
@@ -20,12 +24,21 @@ from app.models.extracted_field import ExtractedField
 from app.services.ai import get_classifier, get_extractor
 from app.services.ai.extractor import snippet_hash
 from app.services.audit import write_audit
-from app.services.extraction import ExtractionError, extract_text
-from app.services.magic import validate_magic_bytes
-from app.services.storage import get_file_bytes
+from app.services.extraction import ExtractionError, PageText, extract_text
+from app.services.magic import MAGIC_PREFIX_LEN, validate_magic_bytes
+from app.services.storage import get_file_bytes, get_file_head, get_local_path
 
 logger = logging.getLogger(__name__)
 
+# Max documents processed concurrently by process_case_documents. Each
+# worker holds a pooled connection, so a /process request uses up to
+# 1 + MAX_PARALLEL_DOCUMENTS of app.database's 5 + 10; at 4, three
+# requests can run at once without waiting on the pool.
+MAX_PARALLEL_DOCUMENTS = 4
+
+# Document statuses whose pages hold complete extracted text
+TEXT_EXTRACTED_STATUSES = ("text_extracted", "classified", "extracted")
+
 # ── Error messages ──────────────────────────────────────────────────────
 ERROR_MESSAGES: dict[str, str] = {
     "encrypted_pdf": "PDF file is password-protected. Please remove the password and re-upload.",
@@ -37,6 +50,7 @@ ERROR_MESSAGES: dict[str, str] = {
     ),
     "unsupported_file": "File content does not match the expected format.",
     "extraction_timeout": "Processing timed out. Please try again.",
+    "processing_failed": "Processing failed. Please try again.",
     "extraction_failed": (
         "Data extraction failed. Please try again."
     ),
@@ -66,6 +80,45 @@ def _set_error(
     return doc
 
 
+def _reuse_extracted_text(db: Session, document: Document) -> list[PageText] | None:
+    """
+    Return the pages of an earlier upload with identical bytes, skipping OCR.
+
+    Matches on sha256_hash + mime_type against documents of the same
+    supplier tenant whose text was already extracted, so one supplier's
+    text (or the fact that a file was uploaded) never leaks to another.
+    Returns None when there is no such document.
+    """
+    if not document.sha256_hash:
+        return None
+
+    source = (
+        db.query(Document)
+        .join(Case, Case.id == Document.case_id)
+        .filter(
+            Case.supplier_tenant_id == document.case.supplier_tenant_id,
+            Document.sha256_hash == document.sha256_hash,
+            Document.mime_type == document.mime_type,
+            Document.id != document.id,
+            Document.processing_status.in_(TEXT_EXTRACTED_STATUSES),
+        )
+        .first()
+    )
+    if source is None or not source.pages:
+        return None
+
+    logger.info("Reusing extracted text of document %s for %s", source.id, document.id)
+    return [
+        PageText(
+            page_number=p.page_number,
+            text=p.extracted_text or "",
+            char_count=p.char_count,
+            method=p.extraction_method,
+        )
+        for p in source.pages
+    ]
+
+
 def process_document(db: Session, document: Document, actor_id: uuid.UUID) -> Document:
     """
     Run the full processing pipeline for a single document.
@@ -77,17 +130,32 @@ def process_document(db: Session, document: Document, actor_id: uuid.UUID) -> Do
 
     Commits after each major step for atomicity.
     """
-    # ── Step 1: Get file bytes ───────────────────────────────────────────────
+    # ── Step 1: Read the file header ─────────────────────────────────────────
     try:
-        file_bytes = get_file_bytes(document.storage_path)
+        head = get_file_head(document.storage_path, MAGIC_PREFIX_LEN)
     except Exception as exc:
         logger.error("Failed to read file for document %s: %s", document.id, exc)
         return _set_error(db, document, actor_id, "unsupported_file")
 
     # ── Step 2: Validate magic bytes ─────────────────────────────────────────
-    if not validate_magic_bytes(file_bytes, document.mime_type):
+    # Checked before anything else is loaded, so rejected uploads cost one
+    # small read. A re-upload of already-extracted bytes reuses that text
+    # and is never fetched; otherwise local files are handed to extraction
+    # by path and Supabase objects are downloaded once.
+    if not validate_magic_bytes(head, document.mime_type):
         return _set_error(db, document, actor_id, "unsupported_file")
 
+    page_texts = _reuse_extracted_text(db, document)
+    source = None
+    if page_texts is None:
+        try:
+            source = get_local_path(document.storage_path) or get_file_bytes(
+                document.storage_path
+            )
+        except Exception as exc:
+            logger.error("Failed to read file for document %s: %s", document.id, exc)
+            return _set_error(db, document, actor_id, "unsupported_file")
+
     # ── Step 3: Update status to "processing" ────────────────────────────────
     document.processing_status = "processing"
     document.error_code = None
@@ -97,7 +165,8 @@ def process_document(db: Session, document: Document, actor_id: uuid.UUID) -> Do
 
     # ── Step 4: Extract text ─────────────────────────────────────────────────
     try:
-        page_texts = extract_text(file_bytes, document.mime_type)
+        if page_texts is None:
+            page_texts = extract_text(source, document.mime_type)
     except ExtractionError as exc:
         return _set_error(db, document, actor_id, exc.error_code, exc.message)
     except Exception as exc:
@@ -166,6 +235,37 @@ def process_document(db: Session, document: Document, actor_id: uuid.UUID) -> Do
     return document
 
 
+def _process_document_by_id(
+    session_factory: sessionmaker, document_id: uuid.UUID, actor_id: uuid.UUID
+) -> None:
+    """
+    Run process_document for one document in a fresh Session (worker thread).
+
+    Never raises: an unexpected failure marks the document errored, so one
+    bad document cannot leave the rest of the case unfinished.
+    """
+    try:
+        with session_factory() as session:
+            document = session.get(Document, document_id)
+            if document is None:
+                logger.warning("Document %s deleted before processing", document_id)
+                return
+            process_document(session, document, actor_id)
+            return
+    except Exception:
+        logger.exception("Processing failed for document %s", document_id)
+
+    # The failed session may hold a broken transaction; record the error
+    # from a fresh one
+    try:
+        with session_factory() as session:
+            document = session.get(Document, document_id)
+            if document is not None:
+                _set_error(session, document, actor_id, "processing_failed")
+    except Exception:
+        logger.exception("Could not mark document %s as errored", document_id)
+
+
 def process_case_documents(
     db: Session, case: Case, actor_id: uuid.UUID
 ) -> list[Document]:
@@ -185,18 +285,45 @@ def process_case_documents(
     write_audit(db, actor_id, "case.processing_started", "case", case.id)
     db.commit()
 
-    # Process each document
-    results: list[Document] = []
-    for doc in documents:
-        result = process_document(db, doc, actor_id)
-        results.append(result)
+    # Process documents concurrently — each worker gets its own Session
+    # (sessions are not thread-safe); the pool size also bounds how many
+    # classifier calls are in flight at once.
+    if len(documents) == 1:
+        results = [process_document(db, documents[0], actor_id)]
+    else:
+        session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PARALLEL_DOCUMENTS, len(documents))
+        ) as pool:
+            list(
+                pool.map(
+                    lambda doc_id: _process_document_by_id(
+                        session_factory, doc_id, actor_id
+                    ),
+                    [d.id for d in documents],
+                )
+            )
+        for doc in documents:
+            db.refresh(doc)
+        results = documents
 
     # Determine final case status
-    all_docs = db.query(Document).filter(Document.case_id == case.id).all()
-    has_errors = any(d.processing_status == "error" for d in all_docs)
-    all_classified = all(
-        d.processing_status in ("classified", "extracted") for d in all_docs
+    error_count, classified_count, doc_count = (
+        db.query(
+            func.sum(sa_case((Document.processing_status == "error", 1), else_=0)),
+            func.sum(
+                sa_case(
+                    (Document.processing_status.in_(("classified", "extracted")), 1),
+                    else_=0,
+                )
+            ),
+            func.count(Document.id),
+        )
+        .filter(Document.case_id == case.id)
+        .one()
     )
+    has_errors = bool(error_count)
+    all_classified = (classified_count or 0) == doc_count
 
     if has_errors:
         case.status = "blocked"
@@ -269,7 +396,10 @@ def run_extraction(
             db, document, actor_id, "extraction_failed"
         )
 
-    # Persist extracted fields + evidence anchors
+    # Persist extracted fields + evidence anchors. Anchors hang off the
+    # field relationship, so no per-field flush is needed for field.id —
+    # the whole batch goes out in the commit below.
+    fields: list[ExtractedField] = []
     for result in output.results:
         field = ExtractedField(
             document_id=document.id,
@@ -285,17 +415,15 @@ def run_extraction(
             visibility="supplier_only",
             created_from="extraction",
         )
-        db.add(field)
-        db.flush()  # get field.id for anchor
-
-        anchor = EvidenceAnchor(
-            field_id=field.id,
+        EvidenceAnchor(
+            field=field,
             document_id=document.id,
             page_no=result.page,
             snippet_text=result.snippet,
             snippet_hash=snippet_hash(result.snippet),
         )
-        db.add(anchor)
+        fields.append(field)
+    db.add_all(fields)
 
     # Update document status
     document.processing_status = "extracted"
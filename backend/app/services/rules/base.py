@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleResult:
     """Output of a single rule evaluation."""
 
@@ -17,7 +17,7 @@ class RuleResult:
     related_field_ids: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ChecklistEntry:
     """A checklist item generated by a rule."""
 
@@ -30,7 +30,7 @@ class ChecklistEntry:
     related_field_id: str | None = None  # UUID string, nullable
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleOutput:
     """Combined output of a rule run."""
 
@@ -40,6 +40,37 @@ class RuleOutput:
     )
 
 
+@dataclass(slots=True)
+class CaseIndex:
+    """Field lookups built in one pass per case and shared by all rules.
+
+    Rules read their inputs from here instead of each re-filtering the
+    full field list.
+    """
+
+    active_fields: list = field(default_factory=list)
+    # non-rejected fields, in input order
+    fields_by_key: dict[str, list] = field(default_factory=dict)
+    # canonical_key -> non-rejected fields, in input order
+    doc_type_by_id: dict = field(default_factory=dict)
+    # document id (UUID) -> doc_type
+    present_doc_types: set[str] = field(default_factory=set)
+    # doc_types of documents that did not error
+
+    @classmethod
+    def build(cls, fields: list, documents: list) -> CaseIndex:
+        index = cls()
+        for f in fields:
+            if f.status != "rejected":
+                index.active_fields.append(f)
+                index.fields_by_key.setdefault(f.canonical_key, []).append(f)
+        for d in documents:
+            index.doc_type_by_id[d.id] = d.doc_type
+            if d.doc_type and d.processing_status != "error":
+                index.present_doc_types.add(d.doc_type)
+        return index
+
+
 class BaseRule(ABC):
     """Abstract base for all validation rules."""
 
@@ -49,6 +80,7 @@ class BaseRule(ABC):
         case_id: str,
         fields: list,
         documents: list,
+        index: CaseIndex,
     ) -> RuleOutput:
         """
         Evaluate rule against case data.
@@ -57,6 +89,7 @@ class BaseRule(ABC):
             case_id: UUID string of the case.
             fields: List of ExtractedField ORM objects for this case.
             documents: List of Document ORM objects for this case.
+            index: CaseIndex built from fields/documents by the engine.
 
         Returns:
             RuleOutput with results and checklist entries.
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import functools
+import re
 from datetime import date, datetime
 
 from app.services.rules.base import (
     BaseRule,
+    CaseIndex,
     ChecklistEntry,
     RuleOutput,
     RuleResult,
@@ -23,19 +26,54 @@ DATE_FORMATS = [
     "%m/%d/%Y",
 ]
 
+# Loose shape of each format (a superset of what strptime accepts), so
+# strptime only runs on values that can plausibly parse
+_DAY = r"\s?\d{1,2}"
+_MONTH_NAME = r"[^\W\d_]+"
+_FORMAT_SHAPES = {
+    "%Y-%m-%d": rf"\d{{4}}-\d{{1,2}}-{_DAY}",
+    "%d %B %Y": rf"{_DAY}\s+{_MONTH_NAME}\s+\d{{4}}",
+    "%d %b %Y": rf"{_DAY}\s+{_MONTH_NAME}\s+\d{{4}}",
+    "%B %d, %Y": rf"{_MONTH_NAME}\s+{_DAY},\s+\d{{4}}",
+    "%Y/%m/%d": rf"\d{{4}}/\d{{1,2}}/{_DAY}",
+    "%d/%m/%Y": rf"{_DAY}/\d{{1,2}}/\d{{4}}",
+    "%m/%d/%Y": rf"\d{{1,2}}/{_DAY}/\d{{4}}",
+}
+_DATE_PATTERNS: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(_FORMAT_SHAPES[fmt]), fmt) for fmt in DATE_FORMATS
+]
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date(value: str) -> date | None:
+    """Parse a certificate date using the first DATE_FORMATS entry that fits.
+
+    Memoized: rules are re-run for dashboards and reports on the same values.
+    """
+    if _ISO_DATE.fullmatch(value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    for pattern, fmt in _DATE_PATTERNS:
+        if pattern.fullmatch(value):
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+    return None
+
 
 class CertificateValidity(BaseRule):
     """Check certificate.*.valid_until is not expired."""
 
     RULE_KEY = "certificate_validity"
 
-    def evaluate(self, case_id, fields, documents) -> RuleOutput:
-        validity_fields = [
-            f
-            for f in fields
-            if f.canonical_key == VALIDITY_KEY
-            and f.status != "rejected"
-        ]
+    def evaluate(
+        self, case_id, fields, documents, index: CaseIndex
+    ) -> RuleOutput:
+        validity_fields = index.fields_by_key.get(VALIDITY_KEY, [])
 
         if not validity_fields:
             return RuleOutput(
@@ -55,15 +93,7 @@ class CertificateValidity(BaseRule):
         field_ids = [str(field.id)]
 
         # Parse date
-        valid_until = None
-        for fmt in DATE_FORMATS:
-            try:
-                valid_until = datetime.strptime(
-                    field.value.strip(), fmt
-                ).date()
-                break
-            except ValueError:
-                continue
+        valid_until = _parse_date(field.value.strip())
 
         if valid_until is None:
             return RuleOutput(
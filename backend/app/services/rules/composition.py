@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import uuid
+
 from app.services.rules.base import (
     BaseRule,
+    CaseIndex,
     ChecklistEntry,
     RuleOutput,
     RuleResult,
@@ -18,6 +21,9 @@ COMPOSITION_ADDEND_KEYS = {
     "material.composition.other_pct",
 }
 
+# Drop "%" and treat "," as the decimal point in one pass (float() strips whitespace)
+_PCT_TRANSLATION = str.maketrans({"%": None, ",": "."})
+
 
 class CompositionSum100(BaseRule):
     """Check that material.composition.*_pct fields sum to 99-101.
@@ -29,12 +35,13 @@ class CompositionSum100(BaseRule):
 
     RULE_KEY = "composition_sum_100"
 
-    def evaluate(self, case_id, fields, documents) -> RuleOutput:
+    def evaluate(
+        self, case_id, fields, documents, index: CaseIndex
+    ) -> RuleOutput:
         comp_fields = [
             f
-            for f in fields
+            for f in index.active_fields
             if f.canonical_key in COMPOSITION_ADDEND_KEYS
-            and f.status != "rejected"
         ]
 
         if not comp_fields:
@@ -52,10 +59,9 @@ class CompositionSum100(BaseRule):
             )
 
         # Group composition fields by document
-        by_doc: dict[str, list] = {}
+        by_doc: dict[uuid.UUID, list] = {}
         for f in comp_fields:
-            doc_id = str(f.document_id)
-            by_doc.setdefault(doc_id, []).append(f)
+            by_doc.setdefault(f.document_id, []).append(f)
 
         # Evaluate each document's composition
         any_pass = False
@@ -63,17 +69,14 @@ class CompositionSum100(BaseRule):
         results_detail: list[str] = []
 
         for doc_id, doc_fields in by_doc.items():
+            short_id = str(doc_id)[:8]
             total = 0.0
             field_ids: list[str] = []
             parse_errors: list[str] = []
 
             for f in doc_fields:
                 try:
-                    val = float(
-                        f.value.replace("%", "")
-                        .replace(",", ".")
-                        .strip()
-                    )
+                    val = float(f.value.translate(_PCT_TRANSLATION))
                     total += val
                     field_ids.append(str(f.id))
                 except (ValueError, AttributeError):
@@ -83,18 +86,18 @@ class CompositionSum100(BaseRule):
 
             if parse_errors:
                 results_detail.append(
-                    f"doc {doc_id[:8]}: parse error"
+                    f"doc {short_id}: parse error"
                 )
                 continue
 
             if 99.0 <= total <= 101.0:
                 any_pass = True
                 results_detail.append(
-                    f"doc {doc_id[:8]}: {total:.1f}% (valid)"
+                    f"doc {short_id}: {total:.1f}% (valid)"
                 )
             else:
                 results_detail.append(
-                    f"doc {doc_id[:8]}: {total:.1f}% (invalid)"
+                    f"doc {short_id}: {total:.1f}% (invalid)"
                 )
 
         if any_pass:
@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-
 from app.services.rules.base import (
     BaseRule,
+    CaseIndex,
     ChecklistEntry,
     RuleOutput,
     RuleResult,
@@ -17,12 +16,11 @@ class ConflictDetection(BaseRule):
 
     RULE_KEY = "conflict_detection"
 
-    def evaluate(self, case_id, fields, documents) -> RuleOutput:
-        # Group fields by canonical_key
-        key_values: dict[str, list] = defaultdict(list)
-        for f in fields:
-            if f.status != "rejected":
-                key_values[f.canonical_key].append(f)
+    def evaluate(
+        self, case_id, fields, documents, index: CaseIndex
+    ) -> RuleOutput:
+        # Non-rejected fields grouped by canonical_key
+        key_values = index.fields_by_key
 
         conflicts_found: list[RuleResult] = []
         checklist_entries: list[ChecklistEntry] = []
@@ -31,15 +29,18 @@ class ConflictDetection(BaseRule):
             if len(field_list) < 2:
                 continue
 
-            # Compare normalized values
-            unique_values: set[str] = set()
-            for f in field_list:
+            # Compare normalized values; stop at the first one that differs
+            first = field_list[0].value.strip().lower().replace(",", "")
+            conflict = False
+            for f in field_list[1:]:
                 normalized = (
                     f.value.strip().lower().replace(",", "")
                 )
-                unique_values.add(normalized)
+                if normalized != first:
+                    conflict = True
+                    break
 
-            if len(unique_values) > 1:
+            if conflict:
                 field_ids = [str(f.id) for f in field_list]
                 vals = [f.value for f in field_list]
                 val_str = " vs ".join(vals)
@@ -14,7 +14,7 @@ from app.models.document import Document
 from app.models.extracted_field import ExtractedField
 from app.models.validation_result import ValidationResult
 from app.services.audit import write_audit
-from app.services.rules.base import RuleOutput
+from app.services.rules.base import CaseIndex, RuleOutput
 from app.services.rules.certificate import CertificateValidity
 from app.services.rules.composition import CompositionSum100
 from app.services.rules.conflicts import ConflictDetection
@@ -79,13 +79,14 @@ class RulesEngine:
         ).delete(synchronize_session="fetch")
         db.flush()
 
-        # Run rules
+        # Run rules — field lookups are built in a single pass and shared
+        index = CaseIndex.build(fields, documents)
         all_results = []
         all_checklist = []
         for rule in ALL_RULES:
             try:
                 output: RuleOutput = rule.evaluate(
-                    str(case.id), fields, documents
+                    str(case.id), fields, documents, index
                 )
                 all_results.extend(output.results)
                 all_checklist.extend(output.checklist_entries)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from app.services.rules.base import (
     BaseRule,
+    CaseIndex,
     ChecklistEntry,
     RuleOutput,
     RuleResult,
@@ -16,6 +17,7 @@ REQUIRED_DOC_TYPES = [
     "test_report",
     "sds",
 ]
+_REQUIRED_SET = frozenset(REQUIRED_DOC_TYPES)
 
 DOC_TYPE_LABELS: dict[str, str] = {
     "invoice": "Commercial Invoice",
@@ -31,20 +33,12 @@ class MissingCriticalDocs(BaseRule):
 
     RULE_KEY = "missing_critical_docs"
 
-    def evaluate(self, case_id, fields, documents) -> RuleOutput:
-        present_types = {
-            d.doc_type
-            for d in documents
-            if d.doc_type and d.processing_status != "error"
-        }
+    def evaluate(
+        self, case_id, fields, documents, index: CaseIndex
+    ) -> RuleOutput:
+        present_types = index.present_doc_types
 
-        missing = [
-            dt
-            for dt in REQUIRED_DOC_TYPES
-            if dt not in present_types
-        ]
-
-        if not missing:
+        if present_types >= _REQUIRED_SET:
             return RuleOutput(
                 results=[
                     RuleResult(
@@ -61,20 +55,22 @@ class MissingCriticalDocs(BaseRule):
             )
 
         missing_labels = [
-            DOC_TYPE_LABELS.get(dt, dt) for dt in missing
+            DOC_TYPE_LABELS.get(dt, dt)
+            for dt in REQUIRED_DOC_TYPES
+            if dt not in present_types
         ]
         checklist_entries = [
             ChecklistEntry(
                 type="missing_document",
                 severity="high",
-                title=f"{DOC_TYPE_LABELS.get(dt, dt)} missing",
+                title=f"{label} missing",
                 description=(
-                    f"{DOC_TYPE_LABELS.get(dt, dt)} document "
+                    f"{label} document "
                     "was not found in this package. "
                     "Please upload the relevant document."
                 ),
             )
-            for dt in missing
+            for label in missing_labels
         ]
 
         return RuleOutput(
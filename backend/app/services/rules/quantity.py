@@ -6,6 +6,7 @@ import re
 
 from app.services.rules.base import (
     BaseRule,
+    CaseIndex,
     ChecklistEntry,
     RuleOutput,
     RuleResult,
@@ -13,11 +14,14 @@ from app.services.rules.base import (
 
 QTY_KEY = "shipment.total_quantity"
 
+# Trailing unit suffix ("pcs", " units"), compiled once
+_TRAIL_UNIT_RE = re.compile(r"[a-zA-Z\s]+$")
+
 
 def _parse_qty(value: str) -> float | None:
     """Parse a quantity string like '12,000' or '12000 pcs'."""
     cleaned = value.replace(",", "").strip()
-    cleaned = re.sub(r"[a-zA-Z\s]+$", "", cleaned)
+    cleaned = _TRAIL_UNIT_RE.sub("", cleaned)
     try:
         return float(cleaned)
     except ValueError:
@@ -29,37 +33,25 @@ class QtyMismatch(BaseRule):
 
     RULE_KEY = "qty_mismatch"
 
-    def evaluate(self, case_id, fields, documents) -> RuleOutput:
-        doc_type_map = {str(d.id): d.doc_type for d in documents}
+    def evaluate(
+        self, case_id, fields, documents, index: CaseIndex
+    ) -> RuleOutput:
+        qty_fields = index.fields_by_key.get(QTY_KEY, [])
+        # A comparison needs one quantity from each side
+        if len(qty_fields) < 2:
+            return self._not_comparable()
 
         qty_by_type: dict[str, list] = {}
-        for f in fields:
-            if (
-                f.canonical_key == QTY_KEY
-                and f.status != "rejected"
-            ):
-                dt = doc_type_map.get(str(f.document_id))
-                if dt:
-                    qty_by_type.setdefault(dt, []).append(f)
+        for f in qty_fields:
+            dt = index.doc_type_by_id.get(f.document_id)
+            if dt:
+                qty_by_type.setdefault(dt, []).append(f)
 
         invoice_fields = qty_by_type.get("invoice", [])
         packing_fields = qty_by_type.get("packing_list", [])
 
         if not invoice_fields or not packing_fields:
-            return RuleOutput(
-                results=[
-                    RuleResult(
-                        rule_key=self.RULE_KEY,
-                        severity="medium",
-                        status="warn",
-                        message=(
-                            "Quantity comparison not possible: "
-                            "quantity field missing in invoice "
-                            "or packing list."
-                        ),
-                    )
-                ]
-            )
+            return self._not_comparable()
 
         inv_field = invoice_fields[0]
         pack_field = packing_fields[0]
@@ -129,3 +121,19 @@ class QtyMismatch(BaseRule):
                 )
             ],
         )
+
+    def _not_comparable(self) -> RuleOutput:
+        return RuleOutput(
+            results=[
+                RuleResult(
+                    rule_key=self.RULE_KEY,
+                    severity="medium",
+                    status="warn",
+                    message=(
+                        "Quantity comparison not possible: "
+                        "quantity field missing in invoice "
+                        "or packing list."
+                    ),
+                )
+            ]
+        )
@@ -1,73 +1,144 @@
+import atexit
+import functools
 import hashlib
+import os
+import shutil
 import uuid
 from pathlib import Path
+from typing import BinaryIO
 
 from app.config import settings
 
 BUCKET_NAME = "documents"
 
+# Chunk size when streaming an upload to local storage
+COPY_BUFFER_SIZE = 1024 * 1024
 
+
+@functools.lru_cache(maxsize=1)
 def _supabase_configured() -> bool:
+    # Settings are fixed after startup; evaluate once
     return bool(settings.supabase_url and settings.supabase_service_key)
 
 
-def compute_sha256(file_bytes: bytes) -> str:
-    return hashlib.sha256(file_bytes).hexdigest()
+@functools.lru_cache(maxsize=1)
+def _supabase_client():
+    """Shared httpx client for Supabase Storage (keeps connections + TLS alive)."""
+    import httpx
+
+    client = httpx.Client(
+        base_url=f"{settings.supabase_url}/storage/v1/object",
+        headers={
+            "apikey": settings.supabase_service_key,
+            "Authorization": f"Bearer {settings.supabase_service_key}",
+        },
+        timeout=30.0,
+    )
+    atexit.register(client.close)
+    return client
+
+
+def compute_sha256(data: bytes | BinaryIO) -> str:
+    """SHA-256 hex digest of bytes, or of a binary file read from its current position."""
+    if isinstance(data, bytes):
+        return hashlib.sha256(data).hexdigest()
+    return hashlib.file_digest(data, "sha256").hexdigest()
 
 
 def upload_file(
-    file_bytes: bytes,
+    source: bytes | BinaryIO,
     filename: str,
     case_id: uuid.UUID,
     document_id: uuid.UUID,
     mime_type: str,
+    size: int | None = None,
 ) -> str:
-    """Upload file to storage. Returns the storage_path."""
+    """
+    Upload file to storage. Returns the storage_path.
+
+    ``source`` is the content or a binary file positioned at its start; a
+    file is streamed to storage without loading it into memory. ``size``
+    is the file's byte length if the caller already knows it.
+    """
     storage_key = f"cases/{case_id}/{document_id}/{filename}"
 
     if _supabase_configured():
-        return _upload_supabase(file_bytes, storage_key, mime_type)
-    return _upload_local(file_bytes, storage_key)
-
+        return _upload_supabase(source, storage_key, mime_type, size)
+    return _upload_local(source, storage_key)
 
-def _upload_supabase(file_bytes: bytes, storage_key: str, mime_type: str) -> str:
-    import httpx
 
-    url = f"{settings.supabase_url}/storage/v1/object/{BUCKET_NAME}/{storage_key}"
+def _upload_supabase(
+    source: bytes | BinaryIO,
+    storage_key: str,
+    mime_type: str,
+    size: int | None = None,
+) -> str:
     headers = {
-        "apikey": settings.supabase_service_key,
-        "Authorization": f"Bearer {settings.supabase_service_key}",
         "Content-Type": mime_type,
         "x-upsert": "true",
     }
-    response = httpx.post(url, content=file_bytes, headers=headers)
+    if isinstance(source, bytes):
+        content = source
+    else:
+        # httpx sizes a file body via fileno(), which would roll a
+        # SpooledTemporaryFile over to disk. Send chunks and state the
+        # length instead.
+        if size is None:
+            start = source.tell()
+            size = source.seek(0, os.SEEK_END) - start
+            source.seek(start)
+        headers["Content-Length"] = str(size)
+        content = iter(functools.partial(source.read, COPY_BUFFER_SIZE), b"")
+    response = _supabase_client().post(
+        f"/{BUCKET_NAME}/{storage_key}", content=content, headers=headers
+    )
     response.raise_for_status()
     return f"{BUCKET_NAME}/{storage_key}"
 
 
-def _upload_local(file_bytes: bytes, storage_key: str) -> str:
+def _upload_local(source: bytes | BinaryIO, storage_key: str) -> str:
     upload_dir = Path(settings.upload_dir)
     file_path = upload_dir / storage_key
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_bytes(file_bytes)
+    if isinstance(source, bytes):
+        file_path.write_bytes(source)
+    else:
+        with file_path.open("wb") as out:
+            shutil.copyfileobj(source, out, COPY_BUFFER_SIZE)
     return str(file_path)
 
 
-def get_file_bytes(storage_path: str) -> bytes:
-    """Retrieve file bytes from storage."""
+def get_local_path(storage_path: str) -> Path | None:
+    """Return the on-disk path of a locally stored file, or None for Supabase objects."""
     if _supabase_configured() and storage_path.startswith(BUCKET_NAME):
-        return _download_supabase(storage_path)
-    return Path(storage_path).read_bytes()
+        return None
+    return Path(storage_path)
 
 
-def _download_supabase(storage_path: str) -> bytes:
-    import httpx
-
-    url = f"{settings.supabase_url}/storage/v1/object/{storage_path}"
-    headers = {
-        "apikey": settings.supabase_service_key,
-        "Authorization": f"Bearer {settings.supabase_service_key}",
-    }
-    response = httpx.get(url, headers=headers)
+def get_file_bytes(storage_path: str) -> bytes:
+    """Retrieve file bytes from storage."""
+    local_path = get_local_path(storage_path)
+    if local_path is None:
+        return _download_supabase(storage_path)
+    return local_path.read_bytes()
+
+
+def get_file_head(storage_path: str, n: int) -> bytes:
+    """Retrieve the first n bytes of a stored file (e.g. for magic-byte checks)."""
+    local_path = get_local_path(storage_path)
+    if local_path is None:
+        # Servers that ignore Range send the whole object; trim it
+        return _download_supabase(storage_path, byte_range=(0, n - 1))[:n]
+    with local_path.open("rb") as f:
+        return f.read(n)
+
+
+def _download_supabase(
+    storage_path: str, byte_range: tuple[int, int] | None = None
+) -> bytes:
+    headers = {}
+    if byte_range is not None:
+        headers["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+    response = _supabase_client().get(f"/{storage_path}", headers=headers)
     response.raise_for_status()
     return response.content
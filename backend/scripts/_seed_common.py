@@ -0,0 +1,99 @@
+"""
+Row helpers shared by the demo and production seeds.
+
+Tenants, users and invites get client-side ids, so dependent rows can
+reference them before any flush and the unit of work inserts each table
+in one batch. Callers own the transaction: nothing here commits.
+"""
+
+from __future__ import annotations
+
+import functools
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.auth import hash_password
+from app.models import (
+    BuyerSupplierLink,
+    Case,
+    Invite,
+    Tenant,
+    User,
+)
+
+
+def create_tenant(db: Session, name: str, slug: str, ttype: str) -> Tenant:
+    t = Tenant(id=uuid.uuid4(), name=name, slug=slug, tenant_type=ttype)
+    db.add(t)
+    return t
+
+
+@functools.cache
+def _demo_password_hash() -> str:
+    """bcrypt is deliberately slow; all demo users share one password."""
+    return hash_password("demo1234")
+
+
+def create_user(
+    db: Session,
+    email: str,
+    name: str,
+    role: str,
+    tenant_id: uuid.UUID,
+) -> User:
+    u = User(
+        id=uuid.uuid4(),
+        email=email,
+        full_name=name,
+        password_hash=_demo_password_hash(),
+        role=role,
+        tenant_id=tenant_id,
+    )
+    db.add(u)
+    return u
+
+
+def link_supplier(
+    db: Session,
+    buyer_tenant: Tenant,
+    supplier_tenant: Tenant,
+    supplier_email: str,
+) -> None:
+    inv = Invite(
+        id=uuid.uuid4(),
+        buyer_tenant_id=buyer_tenant.id,
+        supplier_email=supplier_email,
+        token=f"demo-{supplier_tenant.slug}",
+        status="accepted",
+        expires_at=datetime.now(UTC) + timedelta(days=30),
+        accepted_at=datetime.now(UTC),
+    )
+    link = BuyerSupplierLink(
+        buyer_tenant_id=buyer_tenant.id,
+        supplier_tenant_id=supplier_tenant.id,
+        invite_id=inv.id,
+    )
+    db.add_all([inv, link])
+
+
+def create_case(
+    db: Session,
+    ref: str,
+    supplier_tenant: Tenant,
+    buyer_tenant: Tenant,
+    supplier_user: User,
+    case_status: str = "draft",
+) -> Case:
+    c = Case(
+        reference_no=ref,
+        product_group="textiles",
+        status=case_status,
+        supplier_tenant_id=supplier_tenant.id,
+        buyer_tenant_id=buyer_tenant.id,
+        created_by_user_id=supplier_user.id,
+    )
+    db.add(c)
+    db.flush()
+    return c
@@ -13,11 +13,12 @@ Requires DATABASE_URL to be set (reads from .env or environment).
 """
 
 import argparse
-import subprocess
 import sys
+import traceback
 from pathlib import Path
 
 BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
 
 
 def run_migrations() -> bool:
@@ -25,11 +26,17 @@ def run_migrations() -> bool:
     print("=" * 50)
     print("  Running Alembic migrations …")
     print("=" * 50)
-    result = subprocess.run(
-        [sys.executable, "-m", "alembic", "upgrade", "head"],
-        cwd=str(BACKEND_DIR),
-    )
-    if result.returncode != 0:
+    from alembic.config import Config
+
+    from alembic import command
+
+    cfg = Config(str(BACKEND_DIR / "alembic.ini"))
+    # Resolve against the backend dir, not the caller's cwd
+    cfg.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    try:
+        command.upgrade(cfg, "head")
+    except Exception:
+        traceback.print_exc()
         print("ERROR: Alembic migration failed!")
         return False
     print("Migrations applied successfully.\n")
@@ -41,11 +48,12 @@ def run_seed() -> bool:
     print("=" * 50)
     print("  Seeding demo data (production) …")
     print("=" * 50)
-    result = subprocess.run(
-        [sys.executable, "-m", "scripts.seed_production"],
-        cwd=str(BACKEND_DIR),
-    )
-    if result.returncode != 0:
+    try:
+        from scripts.seed_production import seed
+
+        seed()
+    except Exception:
+        traceback.print_exc()
         print("ERROR: Seed script failed!")
         return False
     print("Production seed completed.\n")
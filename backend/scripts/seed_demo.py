@@ -17,11 +17,11 @@ Usage:
 
 from __future__ import annotations
 
+import functools
 import os
 import shutil
 import sys
 import uuid
-from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 # ── Paths ─────────────────────────────────────────────────
@@ -32,14 +32,10 @@ DEMO_DB = BACKEND / "demo.db"
 DEMO_UPLOADS = BACKEND / "demo_uploads"
 
 # ── Load .env ─────────────────────────────────────────────
-_env_path = BACKEND / ".env"
-if _env_path.exists():
-    with open(_env_path) as _f:
-        for _line in _f:
-            _line = _line.strip()
-            if _line and not _line.startswith("#") and "=" in _line:
-                _key, _val = _line.split("=", 1)
-                os.environ[_key.strip()] = _val.strip()
+# python-dotenv is already loaded by pydantic-settings (app.config)
+from dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(BACKEND / ".env", override=True)
 
 sys.path.insert(0, str(BACKEND))
 
@@ -65,41 +61,46 @@ class PortableUUID(TypeDecorator):
         return value
 
 
-_orig = PG_UUID.__init__
-
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
 
-def _patched(self, as_uuid=False):
-    _orig(self, as_uuid=as_uuid)
 
+def compile_pg_uuid_sqlite(type_, compiler, **kw):
+    return "VARCHAR(36)"
 
-PG_UUID.__init__ = _patched
 
-from sqlalchemy.ext.compiler import compiles  # noqa: E402
+def _install_sqlite_uuid_shim() -> None:
+    """Teach PG_UUID to render on SQLite. Idempotent: safe on re-import."""
+    if getattr(PG_UUID, "_sqlite_shim_installed", False):
+        return
+    orig = PG_UUID.__init__
 
+    def _patched(self, as_uuid=False):
+        orig(self, as_uuid=as_uuid)
 
-@compiles(PG_UUID, "sqlite")
-def compile_pg_uuid_sqlite(type_, compiler, **kw):
-    return "VARCHAR(36)"
+    PG_UUID.__init__ = _patched
+    compiles(PG_UUID, "sqlite")(compile_pg_uuid_sqlite)
+    PG_UUID._sqlite_shim_installed = True
 
 
 # ── Imports ───────────────────────────────────────────────
-from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy import create_engine, event, func, text, update  # noqa: E402
 from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
 
-from app.core.auth import hash_password  # noqa: E402
 from app.models import (  # noqa: E402
-    BuyerSupplierLink,
     Case,
     Document,
     ExtractedField,
-    Invite,
-    Tenant,
-    User,
 )
 from app.models.base import Base  # noqa: E402
 from app.services.pipeline import process_document, run_extraction  # noqa: E402
 from app.services.rules.engine import RulesEngine  # noqa: E402
 from app.services.storage import compute_sha256  # noqa: E402
+from scripts._seed_common import (  # noqa: E402
+    create_case,
+    create_tenant,
+    create_user,
+    link_supplier,
+)
 
 G = "\033[92m"
 Y = "\033[93m"
@@ -111,90 +112,56 @@ def setup_db() -> Session:
         DEMO_DB.unlink()
     if DEMO_UPLOADS.exists():
         shutil.rmtree(DEMO_UPLOADS)
+    _stored_uploads.clear()
     DEMO_UPLOADS.mkdir(parents=True, exist_ok=True)
 
+    _install_sqlite_uuid_shim()
     engine = create_engine(f"sqlite:///{DEMO_DB}", echo=False)
 
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
+        # Throwaway DB rebuilt on every run: trade durability for speed
         cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+        # foreign_keys stays OFF while seeding; main() verifies the graph
+        # once at the end with PRAGMA foreign_key_check
         cursor.close()
 
     Base.metadata.create_all(engine)
     return sessionmaker(bind=engine)()
 
 
-def create_tenant(db: Session, name: str, slug: str, ttype: str) -> Tenant:
-    t = Tenant(name=name, slug=slug, tenant_type=ttype)
-    db.add(t)
-    db.flush()
-    return t
-
-
-def create_user(
-    db: Session,
-    email: str,
-    name: str,
-    role: str,
-    tenant_id: uuid.UUID,
-) -> User:
-    u = User(
-        email=email,
-        full_name=name,
-        password_hash=hash_password("demo1234"),
-        role=role,
-        tenant_id=tenant_id,
-    )
-    db.add(u)
-    db.flush()
-    return u
+@functools.cache
+def _load_sample(fn: str) -> tuple[Path, int, str] | None:
+    """Stat and hash a sample PDF once, however many cases upload it."""
+    pdf_path = SAMPLE_DIR / fn
+    if not pdf_path.exists():
+        return None
+    with pdf_path.open("rb") as f:
+        sha256 = compute_sha256(f)
+    return pdf_path, pdf_path.stat().st_size, sha256
 
 
-def link_supplier(
-    db: Session,
-    buyer_tenant: Tenant,
-    supplier_tenant: Tenant,
-    supplier_email: str,
-) -> None:
-    inv = Invite(
-        buyer_tenant_id=buyer_tenant.id,
-        supplier_email=supplier_email,
-        token=f"demo-{supplier_tenant.slug}",
-        status="accepted",
-        expires_at=datetime.now(UTC) + timedelta(days=30),
-        accepted_at=datetime.now(UTC),
-    )
-    db.add(inv)
-    db.flush()
-    link = BuyerSupplierLink(
-        buyer_tenant_id=buyer_tenant.id,
-        supplier_tenant_id=supplier_tenant.id,
-        invite_id=inv.id,
-    )
-    db.add(link)
+# sha256 -> first upload written with that content
+_stored_uploads: dict[str, Path] = {}
 
 
-def create_case(
-    db: Session,
-    ref: str,
-    supplier_tenant: Tenant,
-    buyer_tenant: Tenant,
-    supplier_user: User,
-    case_status: str = "draft",
-) -> Case:
-    c = Case(
-        reference_no=ref,
-        product_group="textiles",
-        status=case_status,
-        supplier_tenant_id=supplier_tenant.id,
-        buyer_tenant_id=buyer_tenant.id,
-        created_by_user_id=supplier_user.id,
-    )
-    db.add(c)
-    db.commit()
-    return c
+def _store_upload(storage: Path, source: Path, sha256: str) -> None:
+    """Write an upload, hardlinking to an earlier copy of identical content."""
+    existing = _stored_uploads.get(sha256)
+    if existing is not None:
+        try:
+            os.link(existing, storage)
+            return
+        except OSError:
+            pass  # no hardlink support — fall back to a copy
+    shutil.copyfile(source, storage)
+    _stored_uploads.setdefault(sha256, storage)
 
 
 def upload_docs(
@@ -205,29 +172,26 @@ def upload_docs(
 ) -> list[Document]:
     docs = []
     for fn in filenames:
-        pdf_path = SAMPLE_DIR / fn
-        if not pdf_path.exists():
+        sample = _load_sample(fn)
+        if sample is None:
             print(f"  {Y}SKIP: {fn} not found{W}")
             continue
-        file_bytes = pdf_path.read_bytes()
-        sha256 = compute_sha256(file_bytes)
+        pdf_path, file_size, sha256 = sample
         storage = DEMO_UPLOADS / f"{case.reference_no}_{fn}"
-        storage.write_bytes(file_bytes)
+        _store_upload(storage, pdf_path, sha256)
         doc = Document(
             case_id=case.id,
             original_filename=fn,
             storage_path=str(storage),
             mime_type="application/pdf",
-            file_size_bytes=len(file_bytes),
+            file_size_bytes=file_size,
             sha256_hash=sha256,
             processing_status="uploaded",
             uploaded_by=actor_id,
         )
         db.add(doc)
         docs.append(doc)
-    db.commit()
-    for d in docs:
-        db.refresh(d)
+    db.flush()
     return docs
 
 
@@ -236,39 +200,40 @@ def process_and_extract(
     docs: list[Document],
     actor_id: uuid.UUID,
 ) -> int:
-    total_fields = 0
+    extracted = []
     for doc in docs:
-        db.refresh(doc)
+        # process_document commits; expired attributes reload on access
         process_document(db, doc, actor_id)
-        db.refresh(doc)
         if doc.processing_status == "classified" and doc.doc_type:
             run_extraction(db, doc, actor_id, use_mock=True)
-            count = (
-                db.query(ExtractedField)
-                .filter(ExtractedField.document_id == doc.id)
-                .count()
-            )
-            total_fields += count
-            print(f"    {doc.original_filename}: {doc.doc_type}, {count} fields")
-    return total_fields
+            extracted.append(doc)
+    if not extracted:
+        return 0
+
+    # One grouped count for the batch instead of a COUNT per document
+    counts = dict(
+        db.query(ExtractedField.document_id, func.count())
+        .filter(ExtractedField.document_id.in_([d.id for d in extracted]))
+        .group_by(ExtractedField.document_id)
+        .all()
+    )
+    for doc in extracted:
+        count = counts.get(doc.id, 0)
+        print(f"    {doc.original_filename}: {doc.doc_type}, {count} fields")
+    return sum(counts.values())
 
 
 def approve_all_fields(db: Session, case: Case) -> int:
     """Admin approves all pending fields → L2, buyer_visible."""
-    fields = (
-        db.query(ExtractedField)
-        .filter(
+    result = db.execute(
+        update(ExtractedField)
+        .where(
             ExtractedField.case_id == case.id,
             ExtractedField.status == "pending_review",
         )
-        .all()
+        .values(tier="L2", status="approved", visibility="buyer_visible")
     )
-    for f in fields:
-        f.tier = "L2"
-        f.status = "approved"
-        f.visibility = "buyer_visible"
-    db.commit()
-    return len(fields)
+    return result.rowcount
 
 
 def approve_some_fields(
@@ -276,25 +241,24 @@ def approve_some_fields(
     case: Case,
     keys_to_approve: list[str],
 ) -> int:
-    """Admin approves only fields matching given canonical keys."""
-    approved = 0
-    for key in keys_to_approve:
-        field = (
-            db.query(ExtractedField)
-            .filter(
-                ExtractedField.case_id == case.id,
-                ExtractedField.canonical_key == key,
-                ExtractedField.status == "pending_review",
-            )
-            .first()
+    """Admin approves one pending field per given canonical key."""
+    candidates = (
+        db.query(ExtractedField)
+        .filter(
+            ExtractedField.case_id == case.id,
+            ExtractedField.canonical_key.in_(keys_to_approve),
+            ExtractedField.status == "pending_review",
         )
-        if field:
-            field.tier = "L2"
-            field.status = "approved"
-            field.visibility = "buyer_visible"
-            approved += 1
-    db.commit()
-    return approved
+        .all()
+    )
+    first_by_key: dict[str, ExtractedField] = {}
+    for field in candidates:
+        first_by_key.setdefault(field.canonical_key, field)
+    for field in first_by_key.values():
+        field.tier = "L2"
+        field.status = "approved"
+        field.visibility = "buyer_visible"
+    return len(first_by_key)
 
 
 # ══════════════════════════════════════════════════════════
@@ -324,7 +288,6 @@ def main():
     sa_t = create_tenant(db, "Yildiz Tekstil A.S.", "yildiz-tekstil", "supplier")
     sa_u = create_user(db, "info@yildiz.com", "Ahmet Yildiz", "supplier", sa_t.id)
     link_supplier(db, buyer_t, sa_t, "info@yildiz.com")
-    db.commit()
 
     case_a = create_case(db, "YT-2026-001", sa_t, buyer_t, sa_u, "draft")
     docs_a = upload_docs(db, case_a, sa_u.id, [
@@ -361,7 +324,6 @@ def main():
     sb_t = create_tenant(db, "Ozkan Tekstil Ltd.", "ozkan-tekstil", "supplier")
     sb_u = create_user(db, "info@ozkan.com", "Mehmet Ozkan", "supplier", sb_t.id)
     link_supplier(db, buyer_t, sb_t, "info@ozkan.com")
-    db.commit()
 
     case_b = create_case(db, "OZ-2026-001", sb_t, buyer_t, sb_u, "draft")
     docs_b = upload_docs(db, case_b, sb_u.id, [
@@ -399,7 +361,6 @@ def main():
     sc_t = create_tenant(db, "Demir Tekstil San.", "demir-tekstil", "supplier")
     sc_u = create_user(db, "info@demir.com", "Ali Demir", "supplier", sc_t.id)
     link_supplier(db, buyer_t, sc_t, "info@demir.com")
-    db.commit()
 
     case_c = create_case(db, "DM-2026-001", sc_t, buyer_t, sc_u, "draft")
     docs_c = upload_docs(db, case_c, sc_u.id, [
@@ -428,15 +389,16 @@ def main():
     print("  DEMO DATA SUMMARY")
     print(f"{'='*64}")
 
-    from app.services.metrics import compute_case_metrics
+    from app.services.metrics import compute_cases_metrics
 
-    for label, case in [
+    labelled = [
         ("A (Yildiz - HIGH)", case_a),
         ("B (Ozkan - MEDIUM)", case_b),
         ("C (Demir - LOW)", case_c),
-    ]:
-        db.refresh(case)
-        m = compute_case_metrics(db, case)
+    ]
+    metrics = compute_cases_metrics(db, [case for _, case in labelled])
+    for label, case in labelled:
+        m = metrics[case.id]
         print(
             f"\n  {label}:"
             f"\n    Status: {case.status}"
@@ -446,7 +408,10 @@ def main():
             f"\n    Buyer visible: {m.buyer_visible_fields}"
         )
 
+    violations = db.execute(text("PRAGMA foreign_key_check")).fetchall()
     db.close()
+    if violations:
+        raise RuntimeError(f"Seeded DB has foreign key violations: {violations}")
     print(f"\n  DB: {DEMO_DB}")
     print("  Done! Use these credentials to log in:")
     print("    Buyer:  buyer@nordic.com / demo1234")
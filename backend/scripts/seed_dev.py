@@ -37,6 +37,9 @@ def seed():
             print("Database already seeded. Skipping.")
             return
 
+        # All dev users share one password; hash it once (bcrypt is slow)
+        password_hash = hash_password("test1234")
+
         # Buyer tenant + user
         buyer_tenant = Tenant(name="Acme Imports GmbH", slug="acme-imports", tenant_type="buyer")
         db.add(buyer_tenant)
@@ -45,7 +48,7 @@ def seed():
         buyer_user = User(
             email="buyer@test.com",
             full_name="Maria Buyer",
-            password_hash=hash_password("test1234"),
+            password_hash=password_hash,
             role="buyer",
             tenant_id=buyer_tenant.id,
         )
@@ -55,7 +58,7 @@ def seed():
         admin_user = User(
             email="admin@test.com",
             full_name="Alex Admin",
-            password_hash=hash_password("test1234"),
+            password_hash=password_hash,
             role="admin",
             tenant_id=buyer_tenant.id,
         )
@@ -85,7 +88,7 @@ def seed():
         supplier_user = User(
             email="supplier@test.com",
             full_name="Ahmet Supplier",
-            password_hash=hash_password("test1234"),
+            password_hash=password_hash,
             role="supplier",
             tenant_id=supplier_tenant.id,
         )
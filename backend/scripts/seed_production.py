@@ -18,19 +18,13 @@ Usage:
 
 from __future__ import annotations
 
-import uuid
-from datetime import UTC, datetime, timedelta
-
-from sqlalchemy.orm import Session
-
-from app.core.auth import hash_password
 from app.database import SessionLocal
-from app.models import (
-    BuyerSupplierLink,
-    Case,
-    Invite,
-    Tenant,
-    User,
+from app.models import Tenant
+from scripts._seed_common import (
+    create_case,
+    create_tenant,
+    create_user,
+    link_supplier,
 )
 
 G = "\033[92m"
@@ -39,77 +33,6 @@ R = "\033[91m"
 W = "\033[0m"
 
 
-def create_tenant(db: Session, name: str, slug: str, ttype: str) -> Tenant:
-    t = Tenant(name=name, slug=slug, tenant_type=ttype)
-    db.add(t)
-    db.flush()
-    return t
-
-
-def create_user(
-    db: Session,
-    email: str,
-    name: str,
-    role: str,
-    tenant_id: uuid.UUID,
-) -> User:
-    u = User(
-        email=email,
-        full_name=name,
-        password_hash=hash_password("demo1234"),
-        role=role,
-        tenant_id=tenant_id,
-    )
-    db.add(u)
-    db.flush()
-    return u
-
-
-def link_supplier(
-    db: Session,
-    buyer_tenant: Tenant,
-    supplier_tenant: Tenant,
-    supplier_email: str,
-) -> None:
-    inv = Invite(
-        buyer_tenant_id=buyer_tenant.id,
-        supplier_email=supplier_email,
-        token=f"demo-{supplier_tenant.slug}",
-        status="accepted",
-        expires_at=datetime.now(UTC) + timedelta(days=30),
-        accepted_at=datetime.now(UTC),
-    )
-    db.add(inv)
-    db.flush()
-    link = BuyerSupplierLink(
-        buyer_tenant_id=buyer_tenant.id,
-        supplier_tenant_id=supplier_tenant.id,
-        invite_id=inv.id,
-    )
-    db.add(link)
-
-
-def create_case(
-    db: Session,
-    ref: str,
-    supplier_tenant: Tenant,
-    buyer_tenant: Tenant,
-    supplier_user: User,
-    case_status: str = "draft",
-) -> Case:
-    c = Case(
-        reference_no=ref,
-        product_group="textiles",
-        status=case_status,
-        supplier_tenant_id=supplier_tenant.id,
-        buyer_tenant_id=buyer_tenant.id,
-        created_by_user_id=supplier_user.id,
-    )
-    db.add(c)
-    db.commit()
-    return c
-
-
 def seed() -> None:
     """Seed demo data into the production database."""
     print("=" * 64)
@@ -119,8 +42,10 @@ def seed() -> None:
     db = SessionLocal()
     try:
         # ── Check if already seeded ───────────────────────────
-        existing = db.query(Tenant).filter(Tenant.slug == "nordic-fashion").first()
-        if existing:
+        already_seeded = db.query(
+            db.query(Tenant).filter(Tenant.slug == "nordic-fashion").exists()
+        ).scalar()
+        if already_seeded:
             print(f"\n{Y}Already seeded (nordic-fashion tenant exists). Skipping.{W}")
             return
 
@@ -151,9 +76,8 @@ def seed() -> None:
             db, "info@yildiz.com", "Ahmet Yildiz", "supplier", sa_t.id
         )
         link_supplier(db, buyer_t, sa_t, "info@yildiz.com")
-        db.commit()
-
         case_a = create_case(db, "YT-2026-001", sa_t, buyer_t, sa_u, "draft")
+        db.commit()
         print(f"  User: {sa_u.email} / demo1234")
         print(f"  Case: {case_a.reference_no}")
 
@@ -168,9 +92,8 @@ def seed() -> None:
             db, "info@ozkan.com", "Mehmet Ozkan", "supplier", sb_t.id
         )
         link_supplier(db, buyer_t, sb_t, "info@ozkan.com")
-        db.commit()
-
         case_b = create_case(db, "OZ-2026-001", sb_t, buyer_t, sb_u, "draft")
+        db.commit()
         print(f"  User: {sb_u.email} / demo1234")
         print(f"  Case: {case_b.reference_no}")
 
@@ -185,9 +108,8 @@ def seed() -> None:
             db, "info@demir.com", "Ali Demir", "supplier", sc_t.id
         )
         link_supplier(db, buyer_t, sc_t, "info@demir.com")
-        db.commit()
-
         case_c = create_case(db, "DM-2026-001", sc_t, buyer_t, sc_u, "draft")
+        db.commit()
         print(f"  User: {sc_u.email} / demo1234")
         print(f"  Case: {case_c.reference_no}")
 
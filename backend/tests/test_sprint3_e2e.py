@@ -3,7 +3,7 @@
 Sprint 3 — Full End-to-End Demo Checklist.
 
 Creates SQLite DB, seeds data, uploads 6 PDFs, processes,
-extracts fields via Claude API, and verifies all 10 checks.
+extracts fields via Claude API, and verifies all 14 checks.
 
 Usage:
     cd passportai/backend
@@ -104,6 +104,7 @@ from app.models import (  # noqa: E402
 )
 from app.models.base import Base  # noqa: E402
 from app.services.pipeline import (  # noqa: E402
+    process_case_documents,
     process_document,
     run_extraction,
 )
@@ -157,6 +158,7 @@ def setup_db() -> Session:
     def set_sqlite_pragma(dbapi_conn, connection_record):
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # durable enough under WAL
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
 
@@ -214,7 +216,7 @@ def seed_data(db: Session) -> dict:
         invite_id=invite.id,
     )
     db.add(link)
-    db.commit()
+    db.flush()
 
     return {
         "buyer_tenant": buyer_tenant,
@@ -236,7 +238,7 @@ def create_case(db: Session, data: dict) -> Case:
         created_by_user_id=data["supplier_user"].id,
     )
     db.add(case)
-    db.commit()
+    db.flush()
     return case
 
 
@@ -265,12 +267,195 @@ def upload_documents(db: Session, case: Case, actor_id) -> list[Document]:
         db.add(doc)
         docs.append(doc)
 
+    # One commit for seed, case and uploads
     db.commit()
-    for doc in docs:
-        db.refresh(doc)
     return docs
 
 
+def run_case_processing_check(db: Session, data: dict) -> tuple[str, dict[str, str]]:
+    """
+    Process a 3-document case through process_case_documents.
+
+    Two sample PDFs plus one upload whose bytes are not a PDF, so the
+    worker threads cover both the success and the error path. Returns
+    (case status, {filename: processing_status}).
+    """
+    case = Case(
+        reference_no="DEMO-2026-002",
+        product_group="textiles",
+        status="draft",
+        supplier_tenant_id=data["supplier_tenant"].id,
+        buyer_tenant_id=data["buyer_tenant"].id,
+        created_by_user_id=data["supplier_user"].id,
+    )
+    db.add(case)
+    db.flush()
+
+    case_dir = TEST_UPLOADS / "case2"
+    case_dir.mkdir(exist_ok=True)
+    uploads = [
+        (p.name, p.read_bytes())
+        for p in sorted(SAMPLE_DIR.glob("*.pdf"))[:2]
+    ]
+    uploads.append(("not_a_pdf.pdf", b"this is not a PDF"))
+    for name, file_bytes in uploads:
+        storage_path = case_dir / name
+        storage_path.write_bytes(file_bytes)
+        db.add(
+            Document(
+                case_id=case.id,
+                original_filename=name,
+                storage_path=str(storage_path),
+                mime_type="application/pdf",
+                file_size_bytes=len(file_bytes),
+                sha256_hash=compute_sha256(file_bytes),
+                processing_status="uploaded",
+                uploaded_by=data["supplier_user"].id,
+            )
+        )
+    db.commit()
+
+    process_case_documents(db, case, data["supplier_user"].id)
+    return case.status, {
+        d.original_filename: d.processing_status for d in case.documents
+    }
+
+
+def run_text_reuse_check(db: Session, data: dict) -> tuple[str, str]:
+    """
+    Re-upload the sample invoice to a new case, once for the same supplier
+    and once for another supplier tenant.
+
+    The stored file is only the PDF header with the real file's hash, so it
+    passes the magic check but cannot be parsed: a document reaches
+    "classified" only by reusing text already extracted for its tenant.
+    Returns (same-tenant status, other-tenant status).
+    """
+    invoice = SAMPLE_DIR / "01_commercial_invoice.pdf"
+    sha256 = compute_sha256(invoice.read_bytes())
+
+    other_tenant = Tenant(
+        name="Other Supplier Ltd",
+        slug="other-supplier",
+        tenant_type="supplier",
+    )
+    db.add(other_tenant)
+    db.flush()
+    other_user = User(
+        email="supplier@other.com",
+        full_name="Other Supplier",
+        password_hash=data["supplier_user"].password_hash,
+        role="supplier",
+        tenant_id=other_tenant.id,
+    )
+    db.add(other_user)
+    db.flush()
+
+    statuses = []
+    reuse_dir = TEST_UPLOADS / "reuse"
+    reuse_dir.mkdir(exist_ok=True)
+    for n, (tenant, user) in enumerate(
+        [
+            (data["supplier_tenant"], data["supplier_user"]),
+            (other_tenant, other_user),
+        ]
+    ):
+        case = Case(
+            reference_no=f"DEMO-2026-REUSE-{n}",
+            product_group="textiles",
+            status="draft",
+            supplier_tenant_id=tenant.id,
+            buyer_tenant_id=data["buyer_tenant"].id,
+            created_by_user_id=user.id,
+        )
+        db.add(case)
+        db.flush()
+        storage_path = reuse_dir / f"{n}_{invoice.name}"
+        storage_path.write_bytes(invoice.read_bytes()[:8])
+        doc = Document(
+            case_id=case.id,
+            original_filename=invoice.name,
+            storage_path=str(storage_path),
+            mime_type="application/pdf",
+            file_size_bytes=invoice.stat().st_size,
+            sha256_hash=sha256,
+            processing_status="uploaded",
+            uploaded_by=user.id,
+        )
+        db.add(doc)
+        db.commit()
+        statuses.append(process_document(db, doc, user.id).processing_status)
+    return statuses[0], statuses[1]
+
+
+class _SaturatingMessages:
+    """Stub Claude messages API: every invoice key at 0.99 on each call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def count_tokens(self, **kwargs):
+        # Unavailable — the prompt overhead falls back to a local estimate
+        raise RuntimeError("count_tokens disabled in stub")
+
+    async def create(self, **kwargs):
+        import asyncio
+        from types import SimpleNamespace
+
+        from app.services.ai.field_mapping import DOC_TYPE_FIELDS
+
+        self.calls += 1
+        await asyncio.sleep(0.01)  # network round-trip
+        body = json.dumps([
+            {
+                "canonical_key": key,
+                "value": "X",
+                "confidence": 0.99,
+                "page_no": 1,
+                "snippet_text": "X",
+            }
+            for key in DOC_TYPE_FIELDS["invoice"]
+        ])
+        return SimpleNamespace(
+            usage=SimpleNamespace(input_tokens=100, output_tokens=50),
+            content=[SimpleNamespace(text=body)],
+        )
+
+
+def run_saturation_check() -> tuple[int, int, int]:
+    """
+    Extract a 4-page invoice whose first page yields every key.
+
+    Returns (API calls, pages processed, pages skipped).
+    """
+    import asyncio
+    from types import SimpleNamespace
+
+    from app.services.ai.extractor import (
+        BYTES_PER_TOKEN,
+        MAX_PAGE_TOKENS,
+        AsyncClaudeExtractor,
+    )
+
+    messages = _SaturatingMessages()
+
+    class _StubExtractor(AsyncClaudeExtractor):
+        def _get_client(self):
+            return SimpleNamespace(messages=messages)
+
+    # Each page is 3/4 of the page budget, so no two share a batch
+    page_text = "x" * (MAX_PAGE_TOKENS * 3 // 4 * BYTES_PER_TOKEN)
+    pages = [(n, page_text) for n in range(1, 5)]
+    output = asyncio.run(
+        _StubExtractor(api_key="stub").extract_fields("invoice", pages)
+    )
+    return (
+        messages.calls,
+        output.usage.pages_processed,
+        output.usage.pages_skipped,
+    )
+
+
 # ══════════════════════════════════════════════════════════
 #  MAIN
 # ══════════════════════════════════════════════════════════
@@ -551,18 +736,18 @@ def main():
     )
 
     # ── Check 8: Fields span multiple categories ─────────
-    from app.services.ai.field_mapping import FIELD_CATEGORIES
+    from app.services.ai.field_mapping import FIELD_TO_CATEGORY
 
     all_ef = (
         db.query(ExtractedField)
         .filter(ExtractedField.case_id == case.id)
         .all()
     )
-    cats = set()
-    for f in all_ef:
-        for cat, keys in FIELD_CATEGORIES.items():
-            if f.canonical_key in keys:
-                cats.add(cat)
+    cats = {
+        FIELD_TO_CATEGORY[f.canonical_key]
+        for f in all_ef
+        if f.canonical_key in FIELD_TO_CATEGORY
+    }
     check(
         f"Check 8: Fields span multiple categories{tag}",
         len(cats) >= 4,
@@ -660,6 +845,38 @@ def main():
         f"{matches}/{total_gt} = {accuracy:.1f}%",
     )
 
+    # ── Check 11: Saturated extraction skips later pages ─
+    calls, processed, skipped = run_saturation_check()
+    check(
+        "Check 11: Saturated extraction skips later pages",
+        calls == 1 and processed == 1 and skipped == 3,
+        f"{calls} calls, {processed} pages processed, {skipped} skipped",
+    )
+
+    # ── Check 12: Case processing in worker threads ─────
+    case2_status, case2_docs = run_case_processing_check(db, data)
+    statuses = sorted(case2_docs.values())
+    check(
+        "Check 12: Multi-document case processed in parallel",
+        case2_status == "blocked"
+        and statuses == ["classified", "classified", "error"]
+        and case2_docs.get("not_a_pdf.pdf") == "error",
+        f"case={case2_status}, docs={statuses}",
+    )
+
+    # ── Checks 13-14: Text reuse stays within the tenant ─
+    same_status, other_status = run_text_reuse_check(db, data)
+    check(
+        "Check 13: Identical re-upload reuses extracted text",
+        same_status == "classified",
+        f"status={same_status}",
+    )
+    check(
+        "Check 14: No text reuse across supplier tenants",
+        other_status == "error",
+        f"status={other_status}",
+    )
+
     # ══════════════════════════════════════════════════════
     #  SUMMARY
     # ══════════════════════════════════════════════════════
@@ -141,6 +141,7 @@ def setup_db() -> Session:
     def set_sqlite_pragma(dbapi_conn, connection_record):
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # durable enough under WAL
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
 
@@ -205,7 +206,7 @@ def seed_data(db: Session) -> dict:
         invite_id=invite.id,
     )
     db.add(link)
-    db.commit()
+    db.flush()
 
     return {
         "buyer_tenant": buyer_tenant,
@@ -228,7 +229,7 @@ def create_case(db: Session, data: dict) -> Case:
         created_by_user_id=data["supplier_user"].id,
     )
     db.add(case)
-    db.commit()
+    db.flush()
     return case
 
 
@@ -256,9 +257,8 @@ def upload_documents(db: Session, case: Case, actor_id) -> list[Document]:
         db.add(doc)
         docs.append(doc)
 
+    # One commit for seed, case and uploads
     db.commit()
-    for doc in docs:
-        db.refresh(doc)
     return docs
 
 